@@ -0,0 +1,119 @@
+# batchSearch.py
+# --------------
+# Licensing Information: Please do not distribute or publish solutions to this
+# project. You are free to use and extend these projects for educational
+# purposes. The Pacman AI projects were developed at UC Berkeley, primarily by
+# John DeNero (denero@cs.berkeley.edu) and Dan Klein (klein@cs.berkeley.edu).
+# Student side autograding was added by Brad Miller, Nick Hay, and Pieter
+# Abbeel in Spring 2013.
+# For more info, see http://inst.eecs.berkeley.edu/~cs188/pacman/pacman.html
+
+"""
+Solves batches of search problems in parallel with search.solveMany.
+
+Problem specs are read one per line as JSON lists, for example
+
+  ["position", "mediumMaze", [34, 16], [1, 1]]
+  ["corners", "mediumCorners"]
+  ["eightpuzzle", [1, 0, 2, 3, 4, 5, 6, 7, 8]]
+
+or generated at random.  Each result is written as one line of JSON, in the
+order the problems were solved.
+
+  python batchSearch.py -i specs.jsonl -f astar -H manhattanHeuristic -w 4
+  python batchSearch.py --positions mediumMaze -n 1000 -f bfs -o results.jsonl
+  python batchSearch.py --puzzles 5000 -f astar -H eightPuzzleHeuristic
+"""
+
+import json
+import random
+import sys
+import time
+import search
+
+def readSpecs(path):
+    "Yields the specs in a file of JSON lines ('-' for standard input)"
+    if path == '-':
+        f = sys.stdin
+    else:
+        f = open(path)
+    try:
+        for line in f:
+            if line.strip():
+                yield tuple(json.loads(line))
+    finally:
+        if f is not sys.stdin: f.close()
+
+def randomPositionSpecs(layoutName, number):
+    "Yields number position specs between random open cells of a layout"
+    import layout
+    walls = layout.getLayout(layoutName).walls
+    cells = walls.asList(False)
+    for i in range(number):
+        yield ('position', layoutName, random.choice(cells), random.choice(cells))
+
+def randomPuzzleSpecs(number, moves):
+    "Yields number eightpuzzle specs scrambled by moves random moves"
+    import eightpuzzle
+    for i in range(number):
+        puzzle = eightpuzzle.createRandomEightPuzzle(moves)
+        yield ('eightpuzzle', eightpuzzle.puzzleNumbers(puzzle))
+
+if __name__ == '__main__':
+    from optparse import OptionParser
+    parser = OptionParser('USAGE: python batchSearch.py <options>')
+    parser.add_option('-i', '--input', dest='input', metavar='FILE',
+                      help='read problem specs from FILE, one JSON list per line (- for standard input)')
+    parser.add_option('--positions', dest='positions', metavar='LAYOUT',
+                      help='solve random position problems on LAYOUT')
+    parser.add_option('--puzzles', dest='puzzles', type='int', default=0,
+                      help='solve this many random eight puzzles')
+    parser.add_option('-n', '--number', dest='number', type='int', default=100,
+                      help='number of random position problems (default %default)')
+    parser.add_option('-m', '--moves', dest='moves', type='int', default=25,
+                      help='random moves used to scramble each eight puzzle (default %default)')
+    parser.add_option('-f', '--fn', dest='fn', default='bfs',
+                      help='search function from search.py (default %default)')
+    parser.add_option('-H', '--heuristic', dest='heuristic',
+                      help='heuristic name, looked up in the module of each problem')
+    parser.add_option('-w', '--workers', dest='workers', type='int',
+                      help='number of worker processes (default: one per CPU)')
+    parser.add_option('-o', '--output', dest='output', default='-', metavar='FILE',
+                      help='write results to FILE as JSON lines (default standard output)')
+    parser.add_option('--no-actions', dest='actions', action='store_false', default=True,
+                      help='leave the action lists out of the results')
+    parser.add_option('-s', '--seed', dest='seed', type='int',
+                      help='random seed for generated problems')
+    options, otherjunk = parser.parse_args()
+    if len(otherjunk) != 0:
+        parser.error('Command line input not understood: ' + str(otherjunk))
+    if options.seed is not None:
+        random.seed(options.seed)
+
+    if options.input:
+        specs = readSpecs(options.input)
+    elif options.positions:
+        specs = randomPositionSpecs(options.positions, options.number)
+    elif options.puzzles:
+        specs = randomPuzzleSpecs(options.puzzles, options.moves)
+    else:
+        parser.error('Give problems with --input, --positions or --puzzles')
+
+    if options.output == '-':
+        out = sys.stdout
+    else:
+        out = open(options.output, 'w')
+    start = time.time()
+    solved = failed = 0
+    for result in search.solveMany(specs, options.fn, options.heuristic, options.workers):
+        if 'error' in result:
+            failed += 1
+        else:
+            solved += 1
+        if not options.actions:
+            result.pop('actions', None)
+        out.write(json.dumps(result, sort_keys=True) + '\n')
+    if out is not sys.stdout: out.close()
+    elapsed = time.time() - start
+    sys.stderr.write('Solved %d problems (%d failed) in %.2f seconds, %.1f per second\n' %
+                     (solved, failed, elapsed, (solved + failed) / max(elapsed, 1e-9)))
@@ -0,0 +1,161 @@
+# benchmark.py
+# ------------
+# Licensing Information: Please do not distribute or publish solutions to this
+# project. You are free to use and extend these projects for educational
+# purposes. The Pacman AI projects were developed at UC Berkeley, primarily by
+# John DeNero (denero@cs.berkeley.edu) and Dan Klein (klein@cs.berkeley.edu).
+# Student side autograding was added by Brad Miller, Nick Hay, and Pieter
+# Abbeel in Spring 2013.
+# For more info, see http://inst.eecs.berkeley.edu/~cs188/pacman/pacman.html
+
+"""
+Measures how the search functions in search.py scale with the size of the
+board.
+
+For each size, mazeGenerator.py generates a layout, and every search
+function solves the PositionSearchProblem from Pacman to the dot in (1, 1).
+Each run happens in a fresh process, so that its peak memory (the growth of
+the process's maximum resident set size while searching) is its own, and so
+that runs over the time limit can be stopped.  Results are printed as a
+table, or as CSV with -c.
+
+  python benchmark.py --sizes 21,41,81,161 --style maze
+  python benchmark.py --sizes 101,201 -f bfs,astar,jps -H manhattanHeuristic -c > scaling.csv
+"""
+
+import csv
+import inspect
+import multiprocessing
+import sys
+import time
+import mazeGenerator
+import search
+
+try:
+    import resource
+except ImportError:
+    resource = None  # no peak memory outside Unix
+
+# The abbreviations at the end of search.py, in the order of their functions
+FUNCTIONS = tuple(sorted([name for name in dir(search)
+                          if name.islower() and inspect.isfunction(getattr(search, name))],
+                         key=lambda name: getattr(search, name).func_code.co_firstlineno))
+COLUMNS = ('size', 'style', 'function', 'expanded', 'generated', 'cost', 'seconds', 'peakKB', 'status')
+
+def _peakKB():
+    if resource is None: return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+def _runChild(connection, rows, fn, heuristic):
+    import layout, pacman, searchAgents
+    gameState = pacman.GameState()
+    gameState.initialize(layout.Layout(rows), 0)
+    problem = searchAgents.PositionSearchProblem(gameState, warn=False, visualize=False)
+    function = getattr(search, fn)
+    stats = search.SearchStatistics(fn)
+    before = _peakKB()
+    if 'heuristic' in inspect.getargspec(function)[0]:
+        actions = function(problem, getattr(searchAgents, heuristic), stats=stats)
+    else:
+        actions = function(problem, stats=stats)
+    after = _peakKB()
+    result = {'expanded': stats.nodesExpanded, 'generated': stats.nodesGenerated,
+              'seconds': stats.wallTime, 'cost': stats.solutionCost,
+              'peakKB': after - before if before is not None else None,
+              'status': 'ok' if actions is not False else 'no path'}
+    connection.send(result)
+    connection.close()
+
+def runOne(rows, fn, heuristic='manhattanHeuristic', timeLimit=60.0):
+    """
+    Solves the layout rows with the search function named fn in a child
+    process, returning a dictionary with the COLUMNS it measured.
+    """
+    receiver, sender = multiprocessing.Pipe(False)
+    child = multiprocessing.Process(target=_runChild, args=(sender, rows, fn, heuristic))
+    start = time.time()
+    child.start()
+    sender.close()
+    result = None
+    if receiver.poll(timeLimit):
+        try:
+            result = receiver.recv()
+        except EOFError:
+            pass
+    if child.is_alive():
+        child.terminate()
+    child.join()
+    if result is None:
+        status = 'timeout' if time.time() - start >= timeLimit else 'error'
+        result = {'expanded': None, 'generated': None, 'seconds': None, 'cost': None,
+                  'peakKB': None, 'status': status}
+    return result
+
+def benchmark(sizes, functions=FUNCTIONS, style='maze', heuristic='manhattanHeuristic',
+              timeLimit=60.0, seed=0, **layoutOptions):
+    "Yields one result row per size and search function"
+    for size in sizes:
+        rows = mazeGenerator.generateLayout(size, size, style, 1, seed, **layoutOptions)
+        for fn in functions:
+            result = runOne(rows, fn, heuristic, timeLimit)
+            result.update({'size': size, 'style': style, 'function': fn})
+            yield result
+
+def _format(value):
+    if value is None: return '-'
+    if isinstance(value, float): return '%.3f' % value
+    return str(value)
+
+def printTable(results, out=sys.stdout):
+    "Prints results as aligned columns, a row at a time as they arrive"
+    widths = [max(len(column), 10) for column in COLUMNS]
+    widths[2] = max(widths[2], max([len(fn) for fn in FUNCTIONS]))
+    out.write('  '.join([column.rjust(width) for column, width in zip(COLUMNS, widths)]) + '\n')
+    for result in results:
+        out.write('  '.join([_format(result[column]).rjust(width)
+                             for column, width in zip(COLUMNS, widths)]) + '\n')
+        out.flush()
+
+def printCsv(results, out=sys.stdout):
+    writer = csv.writer(out)
+    writer.writerow(COLUMNS)
+    for result in results:
+        writer.writerow([result[column] for column in COLUMNS])
+        out.flush()
+
+if __name__ == '__main__':
+    from optparse import OptionParser
+    parser = OptionParser('USAGE: python benchmark.py <options>')
+    parser.add_option('--sizes', dest='sizes', default='21,41,81',
+                      help='comma-separated board sizes (default %default)')
+    parser.add_option('-t', '--style', dest='style', type='choice', choices=mazeGenerator.STYLES,
+                      default='maze', help='layout style (default %default)')
+    parser.add_option('-f', '--functions', dest='functions', default=','.join(FUNCTIONS),
+                      help='comma-separated search functions (default: all)')
+    parser.add_option('-H', '--heuristic', dest='heuristic', default='manhattanHeuristic',
+                      help='heuristic from searchAgents.py (default %default)')
+    parser.add_option('-l', '--loops', dest='loops', type='float', default=0.0,
+                      help='fraction of extra openings in mazes and rooms (default %default)')
+    parser.add_option('-d', '--density', dest='density', type='float', default=0.2,
+                      help='fraction of walled cells in an arena (default %default)')
+    parser.add_option('-s', '--seed', dest='seed', type='int', default=0,
+                      help='random seed for the layouts (default %default)')
+    parser.add_option('--time-limit', dest='timeLimit', type='float', default=60.0,
+                      help='seconds before a run is stopped (default %default)')
+    parser.add_option('-c', '--csv', dest='csv', action='store_true', default=False,
+                      help='print CSV instead of a table')
+    options, otherjunk = parser.parse_args()
+    if len(otherjunk) != 0:
+        parser.error('Command line input not understood: ' + str(otherjunk))
+
+    sizes = [int(size) for size in options.sizes.split(',')]
+    functions = options.functions.split(',')
+    for fn in functions:
+        if not hasattr(search, fn):
+            parser.error('search.py has no function ' + fn)
+    results = benchmark(sizes, functions, options.style, options.heuristic, options.timeLimit,
+                        options.seed, loops=options.loops, density=options.density)
+    if options.csv:
+        printCsv(results)
+    else:
+        printTable(results)
@@ -8,8 +8,10 @@
 # Abbeel in Spring 2013.
 # For more info, see http://inst.eecs.berkeley.edu/~cs188/pacman/pacman.html
 
+import array
 import search
 import random
+import util
 
 # Module Classes
 
@@ -192,7 +194,7 @@ class EightPuzzleSearchProblem(search.SearchProblem):
         self.puzzle = puzzle
 
     def getStartState(self):
-        return puzzle
+        return self.puzzle
 
     def isGoalState(self,state):
         return state.isGoal()
@@ -258,20 +260,264 @@ def createRandomEightPuzzle(moves=100):
         puzzle = puzzle.result(random.sample(puzzle.legalMoves(), 1)[0])
     return puzzle
 
+def eightPuzzleSearchProblemFromSpec(numbers):
+    "Builds the EightPuzzleSearchProblem of a list of tiles, for search.solveMany"
+    return EightPuzzleSearchProblem(EightPuzzleState(list(numbers)))
+
+# Optimal distances for the whole puzzle
+
+UNSOLVABLE = 0xFF
+_FACTORIALS = [1, 1, 2, 6, 24, 120, 720, 5040, 40320]
+_MOVE_OFFSETS = (('up', -3), ('down', 3), ('left', -1), ('right', 1))
+
+def puzzleNumbers(state):
+    "Returns the tiles of an EightPuzzleState or packed puzzle as a tuple, row by row"
+    if isinstance(state, (int, long)):
+        return unpackPuzzle(state)
+    return tuple(state.cells[0] + state.cells[1] + state.cells[2])
+
+def puzzleRank(numbers):
+    """
+    Returns the position of the permutation numbers of 0..8 in lexicographic
+    order, from 0 to 9! - 1.
+
+    >>> puzzleRank((0, 1, 2, 3, 4, 5, 6, 7, 8)), puzzleRank((8, 7, 6, 5, 4, 3, 2, 1, 0))
+    (0, 362879)
+    """
+    rank = 0
+    for i in range(8):
+        smaller = 0
+        n = numbers[i]
+        for m in numbers[i + 1:]:
+            if m < n: smaller += 1
+        rank += smaller * _FACTORIALS[8 - i]
+    return rank
+
+def _blankMoves(blank):
+    "The (move, new blank index) pairs for the blank at index blank"
+    row, col = divmod(blank, 3)
+    moves = []
+    for move, offset in _MOVE_OFFSETS:
+        if ((move == 'up' and row == 0) or (move == 'down' and row == 2) or
+            (move == 'left' and col == 0) or (move == 'right' and col == 2)):
+            continue
+        moves.append((move, blank + offset))
+    return moves
+
+_BLANK_MOVES = [_blankMoves(blank) for blank in range(9)]
+
+class EightPuzzleDistances:
+    """
+    The optimal number of moves to solve every eight puzzle.
+
+    Moves are reversible, so one breadth-first search backwards from the goal
+    reaches all 9!/2 = 181,440 solvable puzzles.  Their distances are kept in
+    a byte array indexed by puzzleRank (UNSOLVABLE for the other half of the
+    permutations) and written to the cache directory (see util.cachePath) so
+    that the search only ever runs once.
+    """
+    def __init__(self, useCache=True):
+        self.table = None
+        if useCache:
+            self.table = self._load()
+        if self.table is None:
+            self.table = self._compute()
+            if useCache:
+                self._save()
+
+    def distance(self, state):
+        "Returns the number of moves needed to solve state, or None if it cannot be solved"
+        d = self.table[puzzleRank(puzzleNumbers(state))]
+        if d == UNSOLVABLE: return None
+        return d
+
+    def solve(self, state):
+        """
+        Returns an optimal list of moves that solves state, or None if it
+        cannot be solved, by always taking a move that brings the distance
+        down by one.
+        """
+        table = self.table
+        numbers = list(puzzleNumbers(state))
+        d = table[puzzleRank(numbers)]
+        if d == UNSOLVABLE:
+            return None
+        blank = numbers.index(0)
+        moves = []
+        while d > 0:
+            for move, nextBlank in _BLANK_MOVES[blank]:
+                numbers[blank], numbers[nextBlank] = numbers[nextBlank], 0
+                if table[puzzleRank(numbers)] == d - 1:
+                    break
+                numbers[nextBlank], numbers[blank] = numbers[blank], 0
+            moves.append(move)
+            blank, d = nextBlank, d - 1
+        return moves
+
+    def _compute(self):
+        table = array.array('B', [UNSOLVABLE]) * _FACTORIALS[8] * 9
+        goal = (0, 1, 2, 3, 4, 5, 6, 7, 8)
+        table[puzzleRank(goal)] = 0
+        frontier, d = [(goal, 0)], 0
+        while frontier:
+            d += 1
+            nextFrontier = []
+            for numbers, blank in frontier:
+                for move, nextBlank in _BLANK_MOVES[blank]:
+                    nextNumbers = list(numbers)
+                    nextNumbers[blank], nextNumbers[nextBlank] = numbers[nextBlank], 0
+                    rank = puzzleRank(nextNumbers)
+                    if table[rank] == UNSOLVABLE:
+                        table[rank] = d
+                        nextFrontier.append((nextNumbers, nextBlank))
+            frontier = nextFrontier
+        return table
+
+    def _path(self):
+        return util.cachePath('eightPuzzleDistances.bin')
+
+    def _save(self):
+        util.writeCacheFile(self._path(), self.table.tostring())
+
+    def _load(self):
+        return util.readCacheArray(self._path(), 'B', _FACTORIALS[8] * 9)
+
+_eightPuzzleDistances = []
+
+def getEightPuzzleDistances():
+    "Returns the EightPuzzleDistances, building or loading them on first use"
+    if not _eightPuzzleDistances:
+        _eightPuzzleDistances.append(EightPuzzleDistances())
+    return _eightPuzzleDistances[0]
+
+def eightPuzzleHeuristic(state, problem=None):
+    """
+    The exact number of moves left to solve state: a perfect heuristic, so
+    A* with it expands only the states on one optimal path.
+    """
+    d = getEightPuzzleDistances().distance(state)
+    if d is None: return float('inf')
+    return d
+
+def solveEightPuzzle(puzzle):
+    "Returns an optimal list of moves that solves puzzle, or None if it cannot be solved"
+    return getEightPuzzleDistances().solve(puzzle)
+
+# Integer-encoded puzzles
+
+# A packed puzzle is a single int: tile i of the board (row by row) in bits
+# 4i to 4i+3, and the index of the blank in bits 36 to 39.  Ints hash and
+# compare in a few machine operations, and a move is a shift, a mask, a
+# multiplication and two additions.
+
+_BLANK_SHIFT = 36
+_BOARD_MASK = (1 << _BLANK_SHIFT) - 1
+
+def packPuzzle(numbers):
+    "Returns the packed puzzle for a sequence of the tiles 0..8, row by row"
+    code = 0
+    for i, n in enumerate(numbers):
+        code |= n << 4 * i
+    return code | list(numbers).index(0) << _BLANK_SHIFT
+
+def unpackPuzzle(code):
+    "Returns the tiles of a packed puzzle as a tuple, row by row"
+    return tuple([code >> 4 * i & 15 for i in range(9)])
+
+def packEightPuzzle(state):
+    """
+    Returns the packed form of an EightPuzzleState.
+
+    >>> unpackEightPuzzle(packEightPuzzle(loadEightPuzzle(1))) == loadEightPuzzle(1)
+    True
+    """
+    return packPuzzle(puzzleNumbers(state))
+
+def unpackEightPuzzle(code):
+    "Returns the EightPuzzleState of a packed puzzle"
+    return EightPuzzleState(list(unpackPuzzle(code)))
+
+def _packedMoves(blank):
+    """
+    The (move, shift, tileDelta, blankDelta) tuples for the blank at index
+    blank: the tile moved is at bit shift, and the move adds
+    tile * tileDelta + blankDelta to the code.
+    """
+    return [(move, 4 * nextBlank, (1 << 4 * blank) - (1 << 4 * nextBlank), (nextBlank - blank) << _BLANK_SHIFT)
+            for move, nextBlank in _BLANK_MOVES[blank]]
+
+_PACKED_MOVES = [_packedMoves(blank) for blank in range(9)]
+
+class PackedEightPuzzleSearchProblem(search.SearchProblem):
+    """
+      The EightPuzzleSearchProblem with packed puzzles (ints) as states, so
+    that successors, hashing and equality cost a few integer operations
+    instead of copying and stringifying lists.  Actions are the same.
+    """
+    def __init__(self, puzzle):
+        if not isinstance(puzzle, (int, long)):
+            puzzle = packEightPuzzle(puzzle)
+        self.puzzle = puzzle
+        self.goal = packPuzzle(range(9))
+
+    def getStartState(self):
+        return self.puzzle
+
+    def isGoalState(self, state):
+        return state == self.goal
+
+    def getSuccessors(self, state):
+        successors = []
+        for move, shift, tileDelta, blankDelta in _PACKED_MOVES[state >> _BLANK_SHIFT]:
+            successors.append((state + (state >> shift & 15) * tileDelta + blankDelta, move, 1))
+        return successors
+
+    def getCostOfActions(self, actions):
+        return len(actions)
+
 if __name__ == '__main__':
-    puzzle = createRandomEightPuzzle(25)
+    from optparse import OptionParser
+    parser = OptionParser('USAGE: python eightpuzzle.py <options>')
+    parser.add_option('-m', '--moves', dest='moves', type='int', default=25,
+                      help='number of random moves used to scramble the puzzle (default %default)')
+    parser.add_option('-s', '--stats', dest='stats', metavar='FILE',
+                      help='append the search statistics to FILE as JSON (- for standard output)')
+    parser.add_option('-t', '--table', dest='table', action='store_true', default=False,
+                      help='solve with the precomputed distance table instead of BFS')
+    parser.add_option('-p', '--packed', dest='packed', action='store_true', default=False,
+                      help='run BFS on PackedEightPuzzleSearchProblem')
+    parser.add_option('-q', '--quiet', dest='quiet', action='store_true', default=False,
+                      help='do not step through the solution')
+    options, otherjunk = parser.parse_args()
+    if len(otherjunk) != 0:
+        parser.error('Command line input not understood: ' + str(otherjunk))
+
+    puzzle = createRandomEightPuzzle(options.moves)
     print('A random puzzle:')
     print(puzzle)
 
-    problem = EightPuzzleSearchProblem(puzzle)
-    path = search.breadthFirstSearch(problem)
-    print('BFS found a path of %d moves: %s' % (len(path), str(path)))
-    curr = puzzle
-    i = 1
-    for a in path:
-        curr = curr.result(a)
-        print('After %d move%s: %s' % (i, ("", "s")[i>1], a))
-        print(curr)
-
-        raw_input("Press return for the next state...")   # wait for key stroke
-        i += 1
+    if options.table:
+        path = solveEightPuzzle(puzzle)
+        print('The distance table gives a path of %d moves: %s' % (len(path), str(path)))
+    else:
+        if options.packed:
+            problem = PackedEightPuzzleSearchProblem(puzzle)
+        else:
+            problem = EightPuzzleSearchProblem(puzzle)
+        stats = None
+        if options.stats != None:
+            stats = search.SearchStatistics('bfs ' + problem.__class__.__name__)
+        path = search.breadthFirstSearch(problem, stats=stats)
+        print('BFS found a path of %d moves: %s' % (len(path), str(path)))
+        if stats != None:
+            stats.dump(options.stats)
+    if not options.quiet:
+        curr = puzzle
+        i = 1
+        for a in path:
+            curr = curr.result(a)
+            print('After %d move%s: %s' % (i, ("", "s")[i>1], a))
+            print(curr)
+
+            raw_input("Press return for the next state...")   # wait for key stroke
+            i += 1
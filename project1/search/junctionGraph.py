@@ -0,0 +1,155 @@
+# junctionGraph.py
+# ----------------
+# Licensing Information: Please do not distribute or publish solutions to this
+# project. You are free to use and extend these projects for educational
+# purposes. The Pacman AI projects were developed at UC Berkeley, primarily by
+# John DeNero (denero@cs.berkeley.edu) and Dan Klein (klein@cs.berkeley.edu).
+# Student side autograding was added by Brad Miller, Nick Hay, and Pieter
+# Abbeel in Spring 2013.
+# For more info, see http://inst.eecs.berkeley.edu/~cs188/pacman/pacman.html
+
+"""
+Corridor-contracted search graphs for maze layouts.
+
+Most open cells of a maze have exactly two open neighbours, so a search that
+enters them has only one way to go on.  A JunctionGraph keeps only the other
+cells (junctions, dead ends and corners of the board where a search must be
+able to branch) as nodes, and replaces each corridor between two of them by
+a single path.  JunctionSearchProblem runs any search function in search.py
+on that graph: each successor follows a corridor to its end, or to the first
+"stop" cell on the way (a goal, a food dot, a corner of the CornersProblem),
+so start and goal cells in the middle of a corridor are attached on the fly.
+"""
+
+from game import Directions, Actions
+import mazeDistances
+import search
+
+class JunctionGraph:
+    """
+    The junctions of a wall Grid and the corridor paths between them.
+    """
+    def __init__(self, walls):
+        self.walls = walls
+        maze = mazeDistances.getMazeCells(walls)
+        cells = maze.cells
+        neighbours = dict((cell, [cells[i] for i in adjacent])
+                          for cell, adjacent in zip(cells, maze.neighbours))
+        self.junctions = set(cell for cell in cells if len(neighbours[cell]) != 2)
+        self.paths = {}      # junction -> [(cells, actions)] leaving it
+        self.corridors = {}  # corridor cell -> (cells, actions, index) of a path through it
+
+        for junction in list(self.junctions):
+            self._addPaths(junction, neighbours)
+        # Corridors that are closed loops have no junction yet: promote one of their cells
+        for cell in cells:
+            if cell not in self.junctions and cell not in self.corridors:
+                self.junctions.add(cell)
+                self._addPaths(cell, neighbours)
+
+    def _addPaths(self, junction, neighbours):
+        paths = []
+        for cell in neighbours[junction]:
+            path, previous = [junction, cell], junction
+            while cell not in self.junctions:
+                a, b = neighbours[cell]
+                previous, cell = cell, (b if a == previous else a)
+                path.append(cell)
+            path = tuple(path)
+            actions = pathActions(path)
+            for i in range(1, len(path) - 1):
+                self.corridors.setdefault(path[i], (path, actions, i))
+            paths.append((path, actions))
+        self.paths[junction] = paths
+
+    def getPaths(self, cell):
+        """
+        Returns a (cells, actions) pair for every way out of cell: the path to
+        each end of its corridor, or to each neighbouring junction if cell is
+        a junction.  cells starts with cell itself.
+        """
+        if cell in self.junctions:
+            return self.paths[cell]
+        path, actions, i = self.corridors[cell]
+        back = tuple([Directions.REVERSE[action] for action in reversed(actions[:i])])
+        return [(path[i::-1], back), (path[i:], actions[i:])]
+
+    def numNodes(self):
+        return len(self.junctions)
+
+def pathActions(cells):
+    "Returns the tuple of Directions that walks along a path of adjacent cells"
+    return tuple([Actions.vectorToDirection((b[0] - a[0], b[1] - a[1]))
+                  for a, b in zip(cells, cells[1:])])
+
+_graphsByWalls = {}  # id(walls) -> (walls, JunctionGraph)
+
+def getJunctionGraph(walls):
+    "Returns the JunctionGraph of a wall Grid, building it once per layout"
+    entry = _graphsByWalls.get(id(walls))
+    if entry is None or entry[0] is not walls:
+        entry = (walls, JunctionGraph(walls))
+        _graphsByWalls[id(walls)] = entry
+    return entry[1]
+
+class JunctionSearchProblem(search.SearchProblem):
+    """
+    Runs a grid search problem on the junction graph of its layout.
+
+    Successors follow a corridor to its end, stopping early at any of
+    stopCells.  stopCells must include every cell where the problem's goal
+    test can become true or where its state changes other than by moving
+    (food, corners), so that no path runs past one.  Actions are tuples of
+    Directions; use expandActions() to turn a solution back into a plain
+    action list.
+
+    By default states are positions and step costs come from
+    problem.costFn, as in PositionSearchProblem.  For other state spaces pass
+    position(state) -> (x, y) and moveTo(state, cell) -> the state after
+    walking to cell.  Other attributes (goal, corners, walls, ...) are read
+    from the wrapped problem, so heuristics work unchanged.
+    """
+    def __init__(self, problem, stopCells, position=None, moveTo=None, stepCost=None):
+        self.problem = problem
+        self.graph = getJunctionGraph(problem.walls)
+        self.stopCells = set(stopCells)
+        self.position = position or (lambda state: state)
+        self.moveTo = moveTo or (lambda state, cell: cell)
+        if stepCost is None:
+            stepCost = getattr(problem, 'costFn', None)
+        self.stepCost = stepCost
+
+    def __getattr__(self, name):
+        return getattr(self.problem, name)
+
+    def getStartState(self):
+        return self.problem.getStartState()
+
+    def isGoalState(self, state):
+        return self.problem.isGoalState(state)
+
+    def getSuccessors(self, state):
+        stopCells, stepCost = self.stopCells, self.stepCost
+        successors = []
+        for cells, actions in self.graph.getPaths(self.position(state)):
+            end = len(cells) - 1
+            for i in range(1, end):
+                if cells[i] in stopCells:
+                    end = i
+                    break
+            if stepCost is None:
+                cost = end
+            else:
+                cost = sum([stepCost(cell) for cell in cells[1:end + 1]])
+            successors.append((self.moveTo(state, cells[end]), actions[:end], cost))
+        if '_expanded' in dir(self.problem): self.problem._expanded += 1
+        return successors
+
+    def getCostOfActions(self, actions):
+        return self.problem.getCostOfActions(expandActions(actions))
+
+def expandActions(actions):
+    "Flattens a solution of a JunctionSearchProblem into a list of Directions"
+    if actions is False or actions is None:
+        return actions
+    return [action for segment in actions for action in segment]
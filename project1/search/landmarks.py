@@ -0,0 +1,112 @@
+# landmarks.py
+# ------------
+# Licensing Information: Please do not distribute or publish solutions to this
+# project. You are free to use and extend these projects for educational
+# purposes. The Pacman AI projects were developed at UC Berkeley, primarily by
+# John DeNero (denero@cs.berkeley.edu) and Dan Klein (klein@cs.berkeley.edu).
+# Student side autograding was added by Brad Miller, Nick Hay, and Pieter
+# Abbeel in Spring 2013.
+# For more info, see http://inst.eecs.berkeley.edu/~cs188/pacman/pacman.html
+
+"""
+Landmark (ALT) lower bounds on maze distance.
+
+A Landmarks object stores exact breadth-first distances from a few landmark
+cells, chosen far apart from each other.  By the triangle inequality,
+
+  d(p, q) >= |d(L, p) - d(L, q)|   for every landmark L,
+
+which gives an admissible and consistent estimate of maze distance that,
+unlike the Manhattan distance, knows about walls.  This needs memory linear in
+the size of the board, so it works on layouts far too big for the all-pairs
+table in mazeDistances.py.
+"""
+
+import array
+import bisect
+import mazeDistances
+
+UNREACHABLE = -1
+
+class Landmarks:
+    """
+    BFS distance tables from numLandmarks cells of a wall Grid, picked by
+    farthest-point selection.
+    """
+    def __init__(self, walls, numLandmarks=8):
+        self.walls = walls
+        self.maze = mazeDistances.getMazeCells(walls)
+        self.cells, self.cellIndex = self.maze.cells, self.maze.cellIndex
+        self.landmarks = []
+        self.tables = []
+        if not self.cells:
+            return
+
+        # Farthest-point selection: start from the cell farthest from an
+        # arbitrary one, then repeatedly add the cell farthest from every
+        # landmark so far.  Cells no landmark reaches count as infinitely far,
+        # so every connected region gets a landmark.
+        closest = self._bfs(0)
+        for i in range(min(numLandmarks, len(self.cells))):
+            landmark = max(range(len(self.cells)), key=lambda c: _farness(closest[c]))
+            table = self._bfs(landmark)
+            self.landmarks.append(self.cells[landmark])
+            self.tables.append(table)
+            if i == 0:
+                closest = array.array('i', table)
+            else:
+                for c in range(len(closest)):
+                    if table[c] != UNREACHABLE and (closest[c] == UNREACHABLE or table[c] < closest[c]):
+                        closest[c] = table[c]
+
+    def _bfs(self, source):
+        return self.maze.breadthFirst([source], UNREACHABLE)
+
+    def lowerBound(self, p, q):
+        "Returns a lower bound on the maze distance between open cells p and q"
+        i, j = self.cellIndex[p], self.cellIndex[q]
+        bound = 0
+        for table in self.tables:
+            a, b = table[i], table[j]
+            if a != UNREACHABLE and b != UNREACHABLE and abs(a - b) > bound:
+                bound = abs(a - b)
+        return bound
+
+    def targetBound(self, targets):
+        """
+        Returns a function of a position that bounds from below the maze
+        distance to the nearest of targets, in O(landmarks * log(targets)).
+        """
+        indices = [self.cellIndex[target] for target in targets]
+        sortedDistances = []
+        for table in self.tables:
+            sortedDistances.append(sorted([table[i] for i in indices if table[i] != UNREACHABLE]))
+
+        def bound(position):
+            i = self.cellIndex[position]
+            best = 0
+            for table, distances in zip(self.tables, sortedDistances):
+                a = table[i]
+                if a == UNREACHABLE or not distances:
+                    continue
+                # The closest of the targets' landmark distances to a
+                k = bisect.bisect_left(distances, a)
+                gap = min([abs(a - distances[n]) for n in (k - 1, k) if 0 <= n < len(distances)])
+                if gap > best:
+                    best = gap
+            return best
+        return bound
+
+def _farness(distance):
+    if distance == UNREACHABLE: return float('inf')
+    return distance
+
+_landmarksByWalls = {}  # id(walls) -> (walls, Landmarks)
+
+def getLandmarks(walls):
+    "Returns the Landmarks of a wall Grid, building them once per layout"
+    entry = _landmarksByWalls.get(id(walls))
+    if entry is None or entry[0] is not walls:
+        entry = (walls, Landmarks(walls))
+        _landmarksByWalls[id(walls)] = entry
+    return entry[1]
@@ -0,0 +1,282 @@
+# mazeDistances.py
+# ----------------
+# Licensing Information: Please do not distribute or publish solutions to this
+# project. You are free to use and extend these projects for educational
+# purposes. The Pacman AI projects were developed at UC Berkeley, primarily by
+# John DeNero (denero@cs.berkeley.edu) and Dan Klein (klein@cs.berkeley.edu).
+# Student side autograding was added by Brad Miller, Nick Hay, and Pieter
+# Abbeel in Spring 2013.
+# For more info, see http://inst.eecs.berkeley.edu/~cs188/pacman/pacman.html
+
+"""
+All-pairs maze distances for a layout.
+
+A MazeDistances object runs one breadth-first search from every open cell of
+a wall Grid and keeps the results in a flat table of unsigned 16-bit
+integers, so distance(p, q) is a single lookup.  Tables are keyed by the
+layout's wall text and written to the cache directory (see util.cachePath);
+later processes memory-map the file instead of recomputing it.
+
+Use getMazeDistances(walls) rather than building the object directly, so
+that every search problem on the same layout shares one table:
+
+  >>> distances = getMazeDistances(gameState.getWalls())
+  >>> distances.distance((1, 1), (5, 3))
+
+The numbering of the open cells and their neighbour lists that the table is
+built on come from getMazeCells(walls), so that other per-layout tables can
+share them.
+"""
+
+import array
+import hashlib
+import mmap
+import struct
+import sys
+import util
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+UNREACHABLE = 0xFFFF
+_CELL = struct.Struct('<H')
+
+def wallsKey(walls):
+    "A digest of the wall layout that identifies its distance table"
+    text = '%dx%d\n%s' % (walls.width, walls.height, str(walls))
+    return hashlib.sha1(text).hexdigest()
+
+class MazeCells:
+    """
+    The open cells of a wall Grid, numbered column by column, and for each
+    cell index the indices of its open neighbours in the order north, south,
+    east, west.
+    """
+    def __init__(self, walls):
+        self.walls = walls
+        self.cells = [(x, y) for x in range(walls.width) for y in range(walls.height)
+                      if not walls[x][y]]
+        self.cellIndex = dict((cell, i) for i, cell in enumerate(self.cells))
+        self.neighbours = [[self.cellIndex[n] for n in ((x, y + 1), (x, y - 1), (x + 1, y), (x - 1, y))
+                            if not walls[n[0]][n[1]]] for x, y in self.cells]
+
+    def breadthFirst(self, sources, unreached, typecode='i'):
+        """
+        Returns an array of typecode with the maze distance from every cell
+        index to the nearest of the cell indices in sources, or unreached.
+        """
+        distances = array.array(typecode, [unreached]) * len(self.cells)
+        neighbours = self.neighbours
+        for source in sources:
+            distances[source] = 0
+        frontier, d = list(sources), 0
+        while frontier:
+            d += 1
+            nextFrontier = []
+            for cell in frontier:
+                for neighbour in neighbours[cell]:
+                    if distances[neighbour] == unreached:
+                        distances[neighbour] = d
+                        nextFrontier.append(neighbour)
+            frontier = nextFrontier
+        return distances
+
+class MazeDistances:
+    """
+    Exact maze distances between every pair of open cells of a wall Grid.
+    """
+    def __init__(self, walls, useCache=True):
+        self.walls = walls
+        self.maze = getMazeCells(walls)
+        self.cells = self.maze.cells
+        self.cellIndex = self.maze.cellIndex
+        self.numCells = len(self.cells)
+        if self.numCells >= UNREACHABLE:
+            raise ValueError('layout has too many open cells for a 16-bit distance table')
+        self.key = wallsKey(walls)
+        self._lookup = None
+        if useCache and self.numCells > 0:
+            self._lookup = self._load()
+        if self._lookup is None:
+            table = self._compute()
+            self._lookup = table.__getitem__
+            if useCache and self.numCells > 0:
+                self._save(table)
+
+    def distance(self, p, q):
+        """
+        Returns the length of a shortest path between open cells p and q, or
+        float('inf') if q cannot be reached from p.
+        """
+        d = self._lookup(self.cellIndex[p] * self.numCells + self.cellIndex[q])
+        if d == UNREACHABLE: return float('inf')
+        return d
+
+    def _compute(self):
+        table = array.array('H')
+        for source in range(self.numCells):
+            table.extend(self.maze.breadthFirst([source], UNREACHABLE, 'H'))
+        return table
+
+    def _path(self):
+        return util.cachePath('mazeDistances-%s.bin' % self.key)
+
+    def _save(self, table):
+        if sys.byteorder != 'little':
+            table = array.array('H', table)
+            table.byteswap()
+        util.writeCacheFile(self._path(), table.tostring())
+
+    def _load(self):
+        "Memory-maps a cached table, returning its lookup function or None"
+        size = 2 * self.numCells * self.numCells
+        try:
+            f = open(self._path(), 'rb')
+        except IOError:
+            return None
+        try:
+            f.seek(0, 2)
+            if f.tell() != size: return None
+            if numpy is not None:
+                return numpy.memmap(f, dtype='<u2', mode='r').item
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            unpack = _CELL.unpack_from
+            return lambda offset: unpack(data, 2 * offset)[0]
+        finally:
+            f.close()
+
+def distancesFrom(walls, source):
+    """
+    Returns a dictionary from every open cell reachable from source to its
+    maze distance, by a single breadth-first search.  Useful when only a few
+    sources are needed, or the board is too big for a MazeDistances table.
+    """
+    maze = getMazeCells(walls)
+    row = maze.breadthFirst([maze.cellIndex[source]], -1)
+    return dict((cell, d) for cell, d in zip(maze.cells, row) if d >= 0)
+
+class DistanceField:
+    """
+    Maze distance from every open cell to the nearest of a set of source
+    cells (the remaining food, say), kept up to date as sources are removed.
+
+    Removing a source only invalidates the cells whose distances were counted
+    from it: the cells reached from it by steps that add one to the distance.
+    Those are reset, and then refilled from the unaffected cells around them,
+    so each removal costs time in proportion to that region rather than to
+    the whole board.
+    """
+    def __init__(self, walls, sources):
+        maze = getMazeCells(walls)
+        self.cells, self.cellIndex, self.neighbours = maze.cells, maze.cellIndex, maze.neighbours
+        self.sources = set(self.cellIndex[source] for source in sources)
+        self.distances = maze.breadthFirst(self.sources, _FAR)
+
+    def distance(self, cell):
+        "Returns the maze distance from cell to the nearest source, or float('inf')"
+        d = self.distances[self.cellIndex[cell]]
+        if d == _FAR: return float('inf')
+        return d
+
+    def pathFrom(self, cell):
+        """
+        Returns the cells of a shortest path from cell to its nearest source,
+        not including cell itself, by walking down the distance field.
+        Returns None if no source can be reached.
+        """
+        i = self.cellIndex[cell]
+        distances, neighbours = self.distances, self.neighbours
+        if distances[i] == _FAR:
+            return None
+        path = []
+        while distances[i] > 0:
+            for n in neighbours[i]:
+                if distances[n] == distances[i] - 1:
+                    i = n
+                    break
+            path.append(self.cells[i])
+        return path
+
+    def removeSource(self, cell):
+        "Stops counting distances to cell, repairing the field around it"
+        source = self.cellIndex[cell]
+        if source not in self.sources:
+            return
+        self.sources.remove(source)
+        distances, neighbours = self.distances, self.neighbours
+
+        # Every cell whose distance may have been counted from source
+        affected, frontier = set([source]), [source]
+        while frontier:
+            nextFrontier = []
+            for i in frontier:
+                for n in neighbours[i]:
+                    if n not in affected and distances[n] == distances[i] + 1:
+                        affected.add(n)
+                        nextFrontier.append(n)
+            frontier = nextFrontier
+        for i in affected:
+            distances[i] = _FAR
+
+        # Reseed them from their unaffected neighbours and spread inward
+        buckets = []
+        for i in affected:
+            best = _FAR
+            for n in neighbours[i]:
+                if distances[n] + 1 < best:
+                    best = distances[n] + 1
+            if best < _FAR:
+                distances[i] = best
+                while len(buckets) <= best: buckets.append([])
+                buckets[best].append(i)
+        self._fill(buckets)
+
+    def _fill(self, buckets):
+        """
+        Relaxes distances outward from buckets[d], the cells just set to
+        distance d, in increasing order of d.
+        """
+        distances, neighbours = self.distances, self.neighbours
+        d = 0
+        while d < len(buckets):
+            for i in buckets[d]:
+                if distances[i] != d:
+                    continue  # lowered again after it was queued
+                for n in neighbours[i]:
+                    if distances[n] > d + 1:
+                        distances[n] = d + 1
+                        if len(buckets) == d + 1: buckets.append([])
+                        buckets[d + 1].append(n)
+            d += 1
+
+_FAR = 0x7FFFFFFF
+
+_cellsByWalls = {}      # id(walls) -> (walls, MazeCells)
+_distancesByWalls = {}  # id(walls) -> (walls, MazeDistances)
+_distancesByKey = {}    # wallsKey(walls) -> MazeDistances
+
+def getMazeDistances(walls):
+    """
+    Returns the MazeDistances for a wall Grid, building or loading it only
+    the first time this process sees that layout.
+    """
+    entry = _distancesByWalls.get(id(walls))
+    if entry is not None and entry[0] is walls:
+        return entry[1]
+    key = wallsKey(walls)
+    distances = _distancesByKey.get(key)
+    if distances is None:
+        distances = MazeDistances(walls)
+        _distancesByKey[key] = distances
+    _distancesByWalls[id(walls)] = (walls, distances)
+    return distances
+
+def getMazeCells(walls):
+    "Returns the MazeCells for a wall Grid, building it once per layout"
+    entry = _cellsByWalls.get(id(walls))
+    if entry is None or entry[0] is not walls:
+        entry = (walls, MazeCells(walls))
+        _cellsByWalls[id(walls)] = entry
+    return entry[1]
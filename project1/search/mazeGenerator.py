@@ -0,0 +1,202 @@
+# mazeGenerator.py
+# ----------------
+# Licensing Information: Please do not distribute or publish solutions to this
+# project. You are free to use and extend these projects for educational
+# purposes. The Pacman AI projects were developed at UC Berkeley, primarily by
+# John DeNero (denero@cs.berkeley.edu) and Dan Klein (klein@cs.berkeley.edu).
+# Student side autograding was added by Brad Miller, Nick Hay, and Pieter
+# Abbeel in Spring 2013.
+# For more info, see http://inst.eecs.berkeley.edu/~cs188/pacman/pacman.html
+
+"""
+Procedurally generated layouts, for testing searches on boards far bigger
+than the ones in layouts/.
+
+generateLayout returns the text of a layout (a list of rows, as in a .lay
+file) in one of three styles:
+
+  maze   a perfect maze carved by randomized depth-first search; loops
+         knocks out that fraction of the remaining inner walls
+  rooms  square rooms joined by doors into a maze of rooms, plus a
+         fraction loops of extra doors
+  arena  an open board with a fraction density of its cells walled off
+
+Pacman starts in the top right corner.  With a single dot it goes in the
+bottom left corner, (1, 1), like the search mazes, so that the default
+PositionSearchProblem goal is the dot; otherwise the dots are scattered over
+cells Pacman can reach.  The same arguments and seed always give the same
+layout.
+
+  python mazeGenerator.py -W 201 -H 201 --style rooms --food 20 -s 7 -o layouts/rooms201.lay
+"""
+
+import random
+
+STYLES = ('maze', 'rooms', 'arena')
+
+def generateLayout(width, height, style='maze', food=1, seed=0, loops=0.0, density=0.2, roomSize=5):
+    """
+    Returns the rows of a generated layout, top row first.  Mazes and rooms
+    need odd dimensions, so even ones are rounded up.
+    """
+    rng = random.Random(seed)
+    if style == 'maze':
+        walls = _dfsMaze(width | 1, height | 1, rng, loops)
+    elif style == 'rooms':
+        walls = _rooms(width | 1, height | 1, rng, loops, roomSize)
+    elif style == 'arena':
+        walls = _arena(width, height, rng, density)
+    else:
+        raise ValueError('unknown layout style ' + str(style))
+    width, height = len(walls), len(walls[0])
+
+    pacman = (width - 2, height - 2)
+    walls[1][1] = walls[pacman[0]][pacman[1]] = False
+    reachable = _reachable(walls, pacman)
+    reachable.remove(pacman)
+    if food == 1 and (1, 1) in reachable:
+        dots = [(1, 1)]
+    else:
+        reachable.sort()
+        dots = rng.sample(reachable, min(food, len(reachable)))
+
+    rows = [['%' if walls[x][y] else ' ' for x in range(width)] for y in range(height)]
+    for x, y in dots:
+        rows[y][x] = '.'
+    rows[pacman[1]][pacman[0]] = 'P'
+    rows.reverse()
+    return [''.join(row) for row in rows]
+
+def writeLayout(rows, path):
+    "Writes the rows of a layout to a .lay file"
+    f = open(path, 'w')
+    try: f.write('\n'.join(rows) + '\n')
+    finally: f.close()
+
+def _filled(width, height):
+    return [[True] * height for x in range(width)]
+
+def _dfsMaze(width, height, rng, loops):
+    "Carves a maze through the cells with odd coordinates of a walled board"
+    walls = _filled(width, height)
+    start = (1, 1)
+    walls[1][1] = False
+    stack = [start]
+    while stack:
+        x, y = stack[-1]
+        options = [(x + dx, y + dy) for dx, dy in ((0, 2), (0, -2), (2, 0), (-2, 0))
+                   if 0 < x + dx < width - 1 and 0 < y + dy < height - 1 and walls[x + dx][y + dy]]
+        if not options:
+            stack.pop()
+            continue
+        nx, ny = rng.choice(options)
+        walls[(x + nx) // 2][(y + ny) // 2] = walls[nx][ny] = False
+        stack.append((nx, ny))
+    _knockOut(walls, rng, loops)
+    return walls
+
+def _rooms(width, height, rng, loops, roomSize):
+    """
+    Lays out rooms of roomSize x roomSize cells with walls between them, and
+    opens one door between neighbouring rooms along a random spanning tree.
+    """
+    step = roomSize + 1
+    columns, rows = max(1, (width - 1) // step), max(1, (height - 1) // step)
+    width, height = columns * step + 1, rows * step + 1
+    walls = _filled(width, height)
+    for x in range(width):
+        for y in range(height):
+            if x % step and y % step:
+                walls[x][y] = False
+
+    def openDoor(room, other):
+        (i, j), (k, l) = room, other
+        if i != k:  # side by side: a door in the wall column between them
+            x = max(i, k) * step
+            walls[x][j * step + 1 + rng.randrange(roomSize)] = False
+        else:
+            y = max(j, l) * step
+            walls[i * step + 1 + rng.randrange(roomSize)][y] = False
+
+    visited = set([(0, 0)])
+    stack = [(0, 0)]
+    while stack:
+        i, j = stack[-1]
+        options = [(i + di, j + dj) for di, dj in ((0, 1), (0, -1), (1, 0), (-1, 0))
+                   if 0 <= i + di < columns and 0 <= j + dj < rows and (i + di, j + dj) not in visited]
+        if not options:
+            stack.pop()
+            continue
+        other = rng.choice(options)
+        openDoor((i, j), other)
+        visited.add(other)
+        stack.append(other)
+    for i in range(columns):
+        for j in range(rows):
+            for other in ((i + 1, j), (i, j + 1)):
+                if other[0] < columns and other[1] < rows and rng.random() < loops:
+                    openDoor((i, j), other)
+    return walls
+
+def _arena(width, height, rng, density):
+    "An open board with a fraction density of its inner cells walled off at random"
+    walls = _filled(width, height)
+    for x in range(1, width - 1):
+        for y in range(1, height - 1):
+            walls[x][y] = rng.random() < density
+    return walls
+
+def _knockOut(walls, rng, fraction):
+    "Removes a fraction of the inner walls that separate two open cells"
+    if fraction <= 0:
+        return
+    width, height = len(walls), len(walls[0])
+    for x in range(1, width - 1):
+        for y in range(1, height - 1):
+            if walls[x][y] and rng.random() < fraction:
+                if ((not walls[x - 1][y] and not walls[x + 1][y] and walls[x][y - 1] and walls[x][y + 1]) or
+                    (not walls[x][y - 1] and not walls[x][y + 1] and walls[x - 1][y] and walls[x + 1][y])):
+                    walls[x][y] = False
+
+def _reachable(walls, start):
+    "The open cells reachable from start, in the order a breadth-first search finds them"
+    seen = set([start])
+    order = [start]
+    for x, y in order:
+        for cell in ((x, y + 1), (x, y - 1), (x + 1, y), (x - 1, y)):
+            if cell not in seen and not walls[cell[0]][cell[1]]:
+                seen.add(cell)
+                order.append(cell)
+    return order
+
+if __name__ == '__main__':
+    from optparse import OptionParser
+    parser = OptionParser('USAGE: python mazeGenerator.py <options>')
+    parser.add_option('-W', '--width', dest='width', type='int', default=41,
+                      help='width of the layout (default %default)')
+    parser.add_option('-H', '--height', dest='height', type='int', default=41,
+                      help='height of the layout (default %default)')
+    parser.add_option('-t', '--style', dest='style', type='choice', choices=STYLES, default='maze',
+                      help='one of %s (default %%default)' % ', '.join(STYLES))
+    parser.add_option('-f', '--food', dest='food', type='int', default=1,
+                      help='number of dots (default %default)')
+    parser.add_option('-l', '--loops', dest='loops', type='float', default=0.0,
+                      help='fraction of extra openings in mazes and rooms (default %default)')
+    parser.add_option('-d', '--density', dest='density', type='float', default=0.2,
+                      help='fraction of walled cells in an arena (default %default)')
+    parser.add_option('-r', '--room-size', dest='roomSize', type='int', default=5,
+                      help='inner width of each room (default %default)')
+    parser.add_option('-s', '--seed', dest='seed', type='int', default=0,
+                      help='random seed (default %default)')
+    parser.add_option('-o', '--output', dest='output', metavar='FILE',
+                      help='write the layout to FILE instead of standard output')
+    options, otherjunk = parser.parse_args()
+    if len(otherjunk) != 0:
+        parser.error('Command line input not understood: ' + str(otherjunk))
+
+    rows = generateLayout(options.width, options.height, options.style, options.food, options.seed,
+                          options.loops, options.density, options.roomSize)
+    if options.output:
+        writeLayout(rows, options.output)
+    else:
+        print '\n'.join(rows)
@@ -0,0 +1,390 @@
+# npuzzle.py
+# ----------
+# Licensing Information: Please do not distribute or publish solutions to this
+# project. You are free to use and extend these projects for educational
+# purposes. The Pacman AI projects were developed at UC Berkeley, primarily by
+# John DeNero (denero@cs.berkeley.edu) and Dan Klein (klein@cs.berkeley.edu).
+# Student side autograding was added by Brad Miller, Nick Hay, and Pieter
+# Abbeel in Spring 2013.
+# For more info, see http://inst.eecs.berkeley.edu/~cs188/pacman/pacman.html
+
+"""
+N x N sliding puzzles (the 8-puzzle, the 15-puzzle, ...) with additive
+pattern database heuristics.
+
+Puzzles are packed into ints as in eightpuzzle.py: the tile in cell i, row
+by row, is stored in bits*i to bits*i + bits - 1, and the blank's cell
+above all the tiles.  As in the eight puzzle, the goal has the blank in the
+top left corner and tile t in cell t, and moves are named after the
+direction the blank moves in.
+
+A PatternDatabase stores, for every placement of a few of the tiles, the
+fewest moves of those tiles needed to bring them home when the other tiles
+are ignored.  Every move moves one tile, so the values of databases over
+disjoint sets of tiles can be added and still never overestimate
+(AdditivePatternDatabases).  solveSlidingPuzzle runs iterative deepening
+A* on that heuristic, updating it incrementally after each move:
+
+  >>> puzzle = SlidingPuzzle(4)
+  >>> start = puzzle.randomPuzzle(60)
+  >>> moves = solveSlidingPuzzle(puzzle, start)
+
+The databases are built once and written to the cache directory (see
+util.cachePath).  NPuzzleSearchProblem and AdditivePatternDatabases.heuristic
+run the same puzzles through the search functions in search.py.
+"""
+
+import array
+import random
+import search
+import util
+
+MOVES = (('up', -1, 0), ('down', 1, 0), ('left', 0, -1), ('right', 0, 1))
+
+class SlidingPuzzle:
+    """
+    The geometry and packed encoding of the size x size sliding puzzle.
+    """
+    def __init__(self, size):
+        self.size = size
+        self.numCells = size * size
+        self.bits = max(1, (self.numCells - 1).bit_length())
+        self.tileMask = (1 << self.bits) - 1
+        self.blankShift = self.numCells * self.bits
+        self.goal = self.pack(range(self.numCells))
+
+        # neighbours[cell] lists (move, next cell) for the blank in cell, and
+        # moves[cell] the same moves as (move, shift, tileDelta, blankDelta):
+        # the tile moved is at bit shift, and the move adds
+        # tile * tileDelta + blankDelta to the packed puzzle.
+        self.neighbours, self.moves = [], []
+        for cell in range(self.numCells):
+            row, col = divmod(cell, size)
+            neighbours, moves = [], []
+            for move, dr, dc in MOVES:
+                if 0 <= row + dr < size and 0 <= col + dc < size:
+                    other = cell + dr * size + dc
+                    neighbours.append((move, other))
+                    moves.append((move, self.bits * other,
+                                  (1 << self.bits * cell) - (1 << self.bits * other),
+                                  (other - cell) << self.blankShift))
+            self.neighbours.append(neighbours)
+            self.moves.append(moves)
+
+    def pack(self, numbers):
+        "Returns the packed puzzle for a sequence of the tiles 0..numCells-1, row by row"
+        code = 0
+        for i, n in enumerate(numbers):
+            code |= n << self.bits * i
+        return code | list(numbers).index(0) << self.blankShift
+
+    def unpack(self, code):
+        "Returns the tiles of a packed puzzle as a tuple, row by row"
+        return tuple([code >> self.bits * i & self.tileMask for i in range(self.numCells)])
+
+    def result(self, code, move):
+        "Returns the packed puzzle after the blank makes move"
+        for name, shift, tileDelta, blankDelta in self.moves[code >> self.blankShift]:
+            if name == move:
+                return code + (code >> shift & self.tileMask) * tileDelta + blankDelta
+        raise ValueError('illegal move ' + str(move))
+
+    def isSolvable(self, code):
+        """
+        Returns True if the packed puzzle can reach the goal.  A move never
+        changes the parity of the number of inversions among the tiles on an
+        odd board; on an even board a vertical move flips it along with the
+        row of the blank, so their sum keeps its parity instead.
+        """
+        tiles = [n for n in self.unpack(code) if n != 0]
+        inversions = 0
+        for i, tile in enumerate(tiles):
+            for other in tiles[i + 1:]:
+                if other < tile:
+                    inversions += 1
+        if self.size % 2 == 0:
+            inversions += (code >> self.blankShift) // self.size  # the goal's blank is in row 0
+        return inversions % 2 == 0
+
+    def randomPuzzle(self, moves=100):
+        "Returns a packed puzzle made by applying moves random moves to the goal"
+        code = self.goal
+        for i in range(moves):
+            name, shift, tileDelta, blankDelta = random.choice(self.moves[code >> self.blankShift])
+            code += (code >> shift & self.tileMask) * tileDelta + blankDelta
+        return code
+
+    def format(self, code):
+        "Returns a display string for a packed puzzle, as EightPuzzleState prints"
+        width = len(str(self.numCells - 1))
+        numbers = self.unpack(code)
+        line = '-' * ((width + 3) * self.size + 1)
+        lines = [line]
+        for row in range(self.size):
+            cells = numbers[row * self.size:(row + 1) * self.size]
+            lines.append('|' + ''.join([' %*s |' % (width, n or '') for n in cells]))
+            lines.append(line)
+        return '\n'.join(lines)
+
+class NPuzzleSearchProblem(search.SearchProblem):
+    """
+      A SearchProblem for a SlidingPuzzle, with packed puzzles as states.
+    Like PackedEightPuzzleSearchProblem, but for any size.
+    """
+    def __init__(self, puzzle, start):
+        self.puzzle = puzzle
+        self.start = start
+
+    def getStartState(self):
+        return self.start
+
+    def isGoalState(self, state):
+        return state == self.puzzle.goal
+
+    def getSuccessors(self, state):
+        tileMask = self.puzzle.tileMask
+        successors = []
+        for move, shift, tileDelta, blankDelta in self.puzzle.moves[state >> self.puzzle.blankShift]:
+            successors.append((state + (state >> shift & tileMask) * tileDelta + blankDelta, move, 1))
+        return successors
+
+    def getCostOfActions(self, actions):
+        return len(actions)
+
+UNKNOWN = 0xFF
+
+class PatternDatabase:
+    """
+    The fewest moves of tiles needed to bring tiles home from every
+    placement of them, ignoring all other tiles.
+
+    A placement is indexed by packing the cell of tiles[i] into bits*i
+    upwards, so a table for k tiles has 2^(bits*k) byte entries (1M for five
+    tiles of the 15-puzzle, 16M for six) and moving one tile changes the
+    index by a single addition.  The table is filled by a breadth-first
+    search from the goal placement in which a tile may move to any adjacent
+    cell not holding another of tiles.
+    """
+    def __init__(self, puzzle, tiles, useCache=True):
+        self.puzzle = puzzle
+        self.tiles = tuple(tiles)
+        self.table = None
+        if useCache:
+            self.table = self._load()
+        if self.table is None:
+            self.table = self._compute()
+            if useCache:
+                self._save()
+
+    def index(self, cells):
+        "Returns the table index of a placement: cells[i] is the cell of tiles[i]"
+        bits = self.puzzle.bits
+        index = 0
+        for i, cell in enumerate(cells):
+            index |= cell << bits * i
+        return index
+
+    def _size(self):
+        return 1 << self.puzzle.bits * len(self.tiles)
+
+    def _compute(self):
+        bits, tileMask = self.puzzle.bits, self.puzzle.tileMask
+        neighbours = [[other for move, other in moves] for moves in self.puzzle.neighbours]
+        slots = range(len(self.tiles))
+        table = array.array('B', [UNKNOWN]) * self._size()
+        start = self.index(self.tiles)  # tile t belongs in cell t
+        table[start] = 0
+        frontier, d = [start], 0
+        while frontier:
+            d += 1
+            nextFrontier = []
+            for index in frontier:
+                cells = [index >> bits * slot & tileMask for slot in slots]
+                for slot in slots:
+                    cell = cells[slot]
+                    for other in neighbours[cell]:
+                        if other in cells:
+                            continue
+                        nextIndex = index + ((other - cell) << bits * slot)
+                        if table[nextIndex] == UNKNOWN:
+                            table[nextIndex] = d
+                            nextFrontier.append(nextIndex)
+            frontier = nextFrontier
+        return table
+
+    def _path(self):
+        return util.cachePath('npuzzle-%d-%s.bin' % (self.puzzle.size, '-'.join(map(str, self.tiles))))
+
+    def _save(self):
+        util.writeCacheFile(self._path(), self.table.tostring())
+
+    def _load(self):
+        return util.readCacheArray(self._path(), 'B', self._size())
+
+# Partitions of the tiles into disjoint patterns.  6-6-3 is the stronger
+# classic split of the 15-puzzle, but its six-tile tables take minutes to
+# build in Python, so 5-5-5 is the default.
+PARTITIONS = {
+    3: ((1, 2, 3, 4), (5, 6, 7, 8)),
+    4: ((1, 2, 3, 4, 5), (6, 7, 8, 9, 10), (11, 12, 13, 14, 15)),
+}
+FIFTEEN_PUZZLE_6_6_3 = ((1, 2, 3, 4, 5, 6), (7, 8, 9, 10, 11, 12), (13, 14, 15))
+
+# Most index bits of a PatternDatabase in a default partition (32MB tables)
+MAX_PATTERN_INDEX_BITS = 25
+
+def defaultPartition(puzzle):
+    """
+    Returns PARTITIONS[puzzle.size] if there is one.  Other sizes get the
+    tiles in consecutive groups of at most five, or fewer on boards so big
+    that five tiles would need more than 2^MAX_PATTERN_INDEX_BITS entries.
+    """
+    if puzzle.size in PARTITIONS:
+        return PARTITIONS[puzzle.size]
+    group = max(1, min(5, MAX_PATTERN_INDEX_BITS // puzzle.bits))
+    tiles = range(1, puzzle.numCells)
+    return tuple([tuple(tiles[i:i + group]) for i in range(0, len(tiles), group)])
+
+class AdditivePatternDatabases:
+    """
+    The sum of PatternDatabases over a partition of the tiles: an admissible
+    and consistent heuristic for the SlidingPuzzle.
+    """
+    def __init__(self, puzzle, partition=None, useCache=True):
+        if partition is None:
+            partition = defaultPartition(puzzle)
+        self.puzzle = puzzle
+        self.databases = [PatternDatabase(puzzle, tiles, useCache) for tiles in partition]
+        # slots[tile] = (database number, index shift), or None for the blank
+        self.slots = [None] * puzzle.numCells
+        for number, database in enumerate(self.databases):
+            for i, tile in enumerate(database.tiles):
+                self.slots[tile] = (number, puzzle.bits * i)
+
+    def indices(self, numbers):
+        "Returns the index of each database for the tiles numbers, row by row"
+        indices = [0] * len(self.databases)
+        for cell, tile in enumerate(numbers):
+            if self.slots[tile] is not None:
+                number, shift = self.slots[tile]
+                indices[number] |= cell << shift
+        return indices
+
+    def value(self, code):
+        "Returns the heuristic value of a packed puzzle"
+        indices = self.indices(self.puzzle.unpack(code))
+        return sum([database.table[index] for database, index in zip(self.databases, indices)])
+
+    def heuristic(self, state, problem=None):
+        "The value as a heuristic function for the search functions in search.py"
+        return self.value(state)
+
+_databases = {}  # (size, partition) -> AdditivePatternDatabases
+
+def getPatternDatabases(puzzle, partition=None):
+    "Returns the AdditivePatternDatabases for puzzle, building or loading them once"
+    if partition is None:
+        partition = defaultPartition(puzzle)
+    key = (puzzle.size, tuple(map(tuple, partition)))
+    if key not in _databases:
+        _databases[key] = AdditivePatternDatabases(puzzle, partition)
+    return _databases[key]
+
+def solveSlidingPuzzle(puzzle, code, databases=None, stats=None):
+    """
+    Returns an optimal list of moves that solves the packed puzzle code, by
+    iterative deepening A* on additive pattern databases.  Returns None if
+    the puzzle cannot be solved (see SlidingPuzzle.isSolvable).
+
+    Unlike search.idaStarSearch this works on one mutable board: a move
+    swaps two cells and updates the heuristic by looking up only the
+    database of the tile that moved.  Moves straight back are pruned.
+    """
+    if not puzzle.isSolvable(code):
+        return None
+    if databases is None:
+        databases = getPatternDatabases(puzzle)
+    if stats is not None:
+        stats.start()
+    board = list(puzzle.unpack(code))
+    indices = databases.indices(board)
+    tables = [database.table for database in databases.databases]
+    values = [table[index] for table, index in zip(tables, indices)]
+    slots, neighbours = databases.slots, puzzle.neighbours
+    path = []
+
+    def boundedSearch(blank, previous, g, h, bound):
+        # Returns the smallest f over bound below this node, or -1 when solved
+        f = g + h
+        if f > bound:
+            return f
+        if h == 0 and board == goal:
+            return -1
+        if stats is not None: stats.nodesExpanded += 1
+        smallest = float('inf')
+        for move, cell in neighbours[blank]:
+            if cell == previous:
+                continue
+            tile = board[cell]
+            number, shift = slots[tile]
+            oldValue = values[number]
+            indices[number] += (blank - cell) << shift
+            values[number] = tables[number][indices[number]]
+            board[blank], board[cell] = tile, 0
+            path.append(move)
+            if stats is not None: stats.nodesGenerated += 1
+            t = boundedSearch(cell, blank, g + 1, h - oldValue + values[number], bound)
+            if t == -1:
+                return -1
+            path.pop()
+            board[cell], board[blank] = tile, 0
+            indices[number] -= (blank - cell) << shift
+            values[number] = oldValue
+            if t < smallest:
+                smallest = t
+        return smallest
+
+    goal = list(puzzle.unpack(puzzle.goal))
+    bound = sum(values)
+    while True:
+        t = boundedSearch(board.index(0), None, 0, sum(values), bound)
+        if t == -1:
+            if stats is not None: stats.stop(path, len(path))
+            return path
+        bound = t
+
+if __name__ == '__main__':
+    from optparse import OptionParser
+    import time
+    parser = OptionParser('USAGE: python npuzzle.py <options>')
+    parser.add_option('-n', '--size', dest='size', type='int', default=4,
+                      help='the puzzle is SIZE x SIZE (default %default)')
+    parser.add_option('-m', '--moves', dest='moves', type='int', default=60,
+                      help='number of random moves used to scramble the puzzle (default %default)')
+    parser.add_option('--663', dest='sixSixThree', action='store_true', default=False,
+                      help='use the 6-6-3 pattern databases for the 15-puzzle')
+    parser.add_option('-s', '--stats', dest='stats', metavar='FILE',
+                      help='append the search statistics to FILE as JSON (- for standard output)')
+    options, otherjunk = parser.parse_args()
+    if len(otherjunk) != 0:
+        parser.error('Command line input not understood: ' + str(otherjunk))
+
+    puzzle = SlidingPuzzle(options.size)
+    partition = None
+    if options.sixSixThree:
+        partition = FIFTEEN_PUZZLE_6_6_3
+    start = time.time()
+    databases = getPatternDatabases(puzzle, partition)
+    print('Pattern databases ready in %.1f seconds' % (time.time() - start))
+
+    code = puzzle.randomPuzzle(options.moves)
+    print('A random puzzle:')
+    print(puzzle.format(code))
+    stats = None
+    if options.stats != None:
+        stats = search.SearchStatistics('solveSlidingPuzzle %dx%d' % (options.size, options.size))
+    start = time.time()
+    path = solveSlidingPuzzle(puzzle, code, databases, stats)
+    print('IDA* found a path of %d moves in %.2f seconds: %s' % (len(path), time.time() - start, str(path)))
+    if stats != None:
+        stats.dump(options.stats)
@@ -14,6 +14,11 @@ by Pacman agents (in searchAgents.py).
 """
 
 import util
+import json
+import time
+import os
+import multiprocessing
+import multiprocessing.queues
 
 class SearchProblem:
     """
@@ -70,49 +75,168 @@ def tinyMazeSearch(problem):
     return  [s,s,w,s,w,w,s,w]
 
 
-class Node:
+class Node(object):
     """
-    Search node used in graph search
+    Search node used in graph search.
+
+    A node only stores a link to its parent and the action that led to it, so
+    branching is O(1) no matter how deep the node is.  The action list is
+    rebuilt by walking the parent links once a goal node has been found.
     """
-    def __init__(self, state, actions=[], totalCost=0):
+    __slots__ = ('state', 'parent', 'action', 'totalCost')
+
+    def __init__(self, state, parent=None, action=None, totalCost=0):
         self.state = state
-        self.actions = actions
+        self.parent = parent
+        self.action = action
         self.totalCost = totalCost  # total path cost
 
     def branch(self, successor, action, stepCost):
-        new_actions = list(self.actions)
-        new_actions.append(action)
-        return Node(successor, 
-                    new_actions,
-                    self.totalCost + stepCost)
+        return Node(successor, self, action, self.totalCost + stepCost)
+
+    def getActions(self):
+        "Returns the list of actions leading from the root to this node"
+        actions = []
+        node = self
+        while node.parent is not None:
+            actions.append(node.action)
+            node = node.parent
+        actions.reverse()
+        return actions
+
+    actions = property(getActions)
+
+
+class SearchStatistics:
+    """
+    Optional instrumentation for a search run.
+
+    Pass an instance as the stats argument of a search function to record how
+    many nodes were generated and expanded, how many duplicate states were
+    skipped, the peak fringe size, how often the heuristic was called and how
+    long that took, and the wall-clock time of the whole search.  The
+    counters can be written out as one JSON object per run with dump().
+    """
+    def __init__(self, label=None):
+        self.label = label
+        self.nodesGenerated = 0
+        self.nodesExpanded = 0
+        self.duplicatesSkipped = 0
+        self.peakFringeSize = 0
+        self.heuristicCalls = 0
+        self.heuristicTime = 0.0
+        self.wallTime = 0.0
+        self.solutionLength = None
+        self.solutionCost = None
+        self.startTime = None
+
+    def start(self):
+        self.startTime = time.time()
+
+    def stop(self, actions=None, cost=None):
+        "Records the elapsed time and, if a goal was found, the solution found"
+        self.wallTime = time.time() - self.startTime
+        if actions is not None:
+            self.solutionLength = len(actions)
+            self.solutionCost = cost
+
+    def fringeSize(self, size):
+        if size > self.peakFringeSize:
+            self.peakFringeSize = size
+
+    def timeHeuristic(self, heuristic):
+        "Returns a version of heuristic that counts and times its calls"
+        def timedHeuristic(state, problem=None):
+            start = time.time()
+            try:
+                return heuristic(state, problem)
+            finally:
+                self.heuristicCalls += 1
+                self.heuristicTime += time.time() - start
+        return timedHeuristic
+
+    def asDict(self):
+        return {'label': self.label,
+                'nodesGenerated': self.nodesGenerated,
+                'nodesExpanded': self.nodesExpanded,
+                'duplicatesSkipped': self.duplicatesSkipped,
+                'peakFringeSize': self.peakFringeSize,
+                'heuristicCalls': self.heuristicCalls,
+                'heuristicTime': self.heuristicTime,
+                'wallTime': self.wallTime,
+                'solutionLength': self.solutionLength,
+                'solutionCost': self.solutionCost}
+
+    def toJson(self):
+        return json.dumps(self.asDict(), sort_keys=True)
+
+    def dump(self, out):
+        """
+        Appends the statistics as one line of JSON to out, which is either an
+        open file or a file name ('-' means standard output).
+        """
+        if hasattr(out, 'write'):
+            out.write(self.toJson() + '\n')
+        elif out == '-':
+            print self.toJson()
+        else:
+            f = open(out, 'a')
+            try: f.write(self.toJson() + '\n')
+            finally: f.close()
 
 
 class GraphSearch:
     """
     Generalized graph search. 
+
+    Successors whose state is already closed are never pushed.  With an
+    indexed fringe (util.BucketQueueWithFunction keyed on the node state)
+    each state is also on the fringe at most once.
     """
     def __init__(self, queue_class, *queue_args):
         self.queue_class = queue_class
         self.queue_args = queue_args
 
-    def search(self, problem):
+    def search(self, problem, stats=None):
+        """
+        Returns the list of actions to the first goal popped, or False if
+        there is none.  stats, if given, is a SearchStatistics to fill in.
+        """
+        if stats is not None:
+            stats.start()
         closed = set()
         fringe = self.queue_class(*self.queue_args)
         fringe.push(Node(problem.getStartState()))
         while True:
             if fringe.isEmpty():
+                if stats is not None: stats.stop()
                 return False
             node = fringe.pop()
             if problem.isGoalState(node.state):
-                return node.actions
+                actions = node.getActions()
+                if stats is not None: stats.stop(actions, node.totalCost)
+                return actions
             if node.state not in closed:
                 closed.add(node.state)
-                for successor_args in problem.getSuccessors(node.state):
-                    fringe.push(node.branch(*successor_args))
-
-
-
-def depthFirstSearch(problem):
+                successors = problem.getSuccessors(node.state)
+                for successor, action, stepCost in successors:
+                    if successor not in closed:
+                        fringe.push(node.branch(successor, action, stepCost))
+                    elif stats is not None:
+                        stats.duplicatesSkipped += 1
+                if stats is not None:
+                    stats.nodesExpanded += 1
+                    stats.nodesGenerated += len(successors)
+                    stats.fringeSize(len(fringe))
+            elif stats is not None:
+                stats.duplicatesSkipped += 1
+
+
+def nodeState(node):
+    "Key function that identifies fringe entries by their search state"
+    return node.state
+
+def depthFirstSearch(problem, stats=None):
     """
     Search the deepest nodes in the search tree first
 
@@ -127,22 +251,28 @@ def depthFirstSearch(problem):
     print "Start's successors:", problem.getSuccessors(problem.getStartState())
     """
     graph_search = GraphSearch(util.Stack)
-    return graph_search.search(problem)
+    return graph_search.search(problem, stats)
 
-def breadthFirstSearch(problem):
+def breadthFirstSearch(problem, stats=None):
     """
     Search the shallowest nodes in the search tree first.
     """
     graph_search = GraphSearch(util.Queue)
-    return graph_search.search(problem)
+    return graph_search.search(problem, stats)
+
+def uniformCostSearch(problem, stats=None):
+    """
+    Search the node of least total cost first.
 
-def uniformCostSearch(problem):
-    "Search the node of least total cost first. "
+    The fringe is a bucket queue while path costs are small non-negative
+    integers (every Pacman problem) and falls back to a binary heap as soon as
+    a fractional cost shows up, with the same expansion order either way.
+    """
     def priority_fun(node):
         return node.totalCost
 
-    graph_search = GraphSearch(util.PriorityQueueWithFunction, priority_fun)
-    return graph_search.search(problem)
+    graph_search = GraphSearch(util.BucketQueueWithFunction, priority_fun, nodeState)
+    return graph_search.search(problem, stats)
 
 def nullHeuristic(state, problem=None):
     """
@@ -151,17 +281,696 @@ def nullHeuristic(state, problem=None):
     """
     return 0
 
-def aStarSearch(problem, heuristic=nullHeuristic):
-    "Search the node that has the lowest combined cost and heuristic first."
+def aStarSearch(problem, heuristic=nullHeuristic, stats=None):
+    """
+    Search the node that has the lowest combined cost and heuristic first.
+
+    Uses the same bucket queue / binary heap fringe as uniformCostSearch.
+    """
+    if stats is not None:
+        heuristic = stats.timeHeuristic(heuristic)
+
     def priority_fun(node):
         return heuristic(node.state, problem) + node.totalCost
 
-    graph_search = GraphSearch(util.PriorityQueueWithFunction, priority_fun)
-    return graph_search.search(problem)    
+    graph_search = GraphSearch(util.BucketQueueWithFunction, priority_fun, nodeState)
+    return graph_search.search(problem, stats)
+
+def lazyAStarSearch(problem, heuristic=nullHeuristic, stats=None):
+    """
+    A* that only computes the heuristic of a state when a node for it is
+    first popped, instead of for every successor pushed.
+
+    A successor is pushed with the larger of its parent's f and its own path
+    cost, which for a consistent heuristic never exceeds its true f.  When it
+    is popped its heuristic is computed (once per state); if that raises f
+    above the key it was popped with, it goes back on the fringe with its
+    real f, otherwise it is expanded at once.  Nodes left on the fringe when
+    the goal is found never cost a heuristic call, which pays off with
+    expensive heuristics such as foodHeuristic and cornersHeuristic.  Paths
+    are optimal for consistent heuristics, as with aStarSearch.
+
+    getSuccessors may return any iterable, including a generator.
+    """
+    if stats is not None:
+        stats.start()
+        heuristic = stats.timeHeuristic(heuristic)
+    closed = set()
+    heuristicValues = {}
+    fringe = util.PriorityQueue()
+    start = Node(problem.getStartState())
+    fringe.push((start, 0, False), 0)
+    while not fringe.isEmpty():
+        node, key, evaluated = fringe.pop()
+        state = node.state
+        if state in closed:
+            if stats is not None: stats.duplicatesSkipped += 1
+            continue
+        if problem.isGoalState(state):
+            actions = node.getActions()
+            if stats is not None: stats.stop(actions, node.totalCost)
+            return actions
+        if not evaluated:
+            if state not in heuristicValues:
+                heuristicValues[state] = heuristic(state, problem)
+            f = node.totalCost + heuristicValues[state]
+            if f > key:
+                fringe.push((node, f, True), f)
+                continue
+            key = f
+        closed.add(state)
+        generated = 0
+        for successor, action, stepCost in problem.getSuccessors(state):
+            generated += 1
+            if successor in closed:
+                if stats is not None: stats.duplicatesSkipped += 1
+                continue
+            child = node.branch(successor, action, stepCost)
+            childKey = max(key, child.totalCost)
+            fringe.push((child, childKey, False), childKey)
+        if stats is not None:
+            stats.nodesExpanded += 1
+            stats.nodesGenerated += generated
+            stats.fringeSize(len(fringe))
+    if stats is not None: stats.stop()
+    return False
+
+IDA_STAR_TABLE_SIZE = 1 << 16
+
+def idaStarSearch(problem, heuristic=nullHeuristic, stats=None, tableSize=IDA_STAR_TABLE_SIZE):
+    """
+    Iterative deepening A*: repeated depth-first searches that cut off nodes
+    whose f = g + h exceeds a bound, raising the bound to the smallest f that
+    was cut off until a goal is found.  Returns optimal paths for admissible
+    heuristics while only keeping the current path in memory.
+
+    Cycles along the current path are always pruned.  tableSize bounds a
+    transposition table of the cheapest g seen for each state during an
+    iteration, which prunes most transpositions on graphs with many paths to
+    the same state; tableSize=0 turns it off and keeps memory O(depth).
+    """
+    if stats is not None:
+        stats.start()
+        heuristic = stats.timeHeuristic(heuristic)
+    start = problem.getStartState()
+    bound = heuristic(start, problem)
+    while True:
+        actions, cost, bound = _costBoundedSearch(problem, heuristic, start, bound, tableSize, stats)
+        if actions is not None or bound == float('inf'):
+            if stats is not None: stats.stop(actions, cost)
+            if actions is None: return False
+            return actions
+
+def _costBoundedSearch(problem, heuristic, start, bound, tableSize, stats):
+    """
+    One iteration of idaStarSearch.  Returns (actions, cost, bound) for the
+    first goal with f <= bound, or (None, None, nextBound) where nextBound is
+    the smallest f that exceeded bound.
+    """
+    if problem.isGoalState(start):
+        return [], 0, bound
+    nextBound = float('inf')
+    table = {start: 0}
+    path, actions, costs = [start], [], [0]
+    onPath = set(path)
+    successorLists = [iter(problem.getSuccessors(start))]
+    if stats is not None: stats.nodesExpanded += 1
+    while successorLists:
+        if stats is not None:
+            stats.fringeSize(len(path))
+        for successor, action, stepCost in successorLists[-1]:
+            if stats is not None: stats.nodesGenerated += 1
+            g = costs[-1] + stepCost
+            if successor in onPath:
+                if stats is not None: stats.duplicatesSkipped += 1
+                continue
+            best = table.get(successor)
+            if best is not None and best <= g:
+                if stats is not None: stats.duplicatesSkipped += 1
+                continue
+            if best is not None or len(table) < tableSize:
+                table[successor] = g
+            f = g + heuristic(successor, problem)
+            if f > bound:
+                nextBound = min(nextBound, f)
+                continue
+            actions.append(action)
+            if problem.isGoalState(successor):
+                return actions, g, bound
+            path.append(successor)
+            onPath.add(successor)
+            costs.append(g)
+            successorLists.append(iter(problem.getSuccessors(successor)))
+            if stats is not None: stats.nodesExpanded += 1
+            break
+        else:
+            # Every successor of the last node on the path has been tried
+            successorLists.pop()
+            onPath.discard(path.pop())
+            costs.pop()
+            if actions: actions.pop()
+    return None, None, nextBound
+
+class JumpPointProblem(SearchProblem):
+    """
+    The jump point graph of a grid problem with unit step costs (a
+    PositionSearchProblem or AnyFoodSearchProblem): Jump Point Search
+    adapted to 4-connected moves.
+
+    Among the shortest paths on an open grid we only follow the canonical
+    ones that move horizontally before vertically, turning from a vertical
+    move to a horizontal one only where a wall blocks the horizontal-first
+    alternative.  Straight runs that cannot contain such a turn, or a goal,
+    are skipped in a single successor, so open areas cost a few expansions
+    instead of one per cell.
+
+    States are (position, direction) pairs, actions are (direction, steps)
+    segments and step costs are the number of cells jumped.
+    """
+    def __init__(self, problem):
+        from game import Directions
+        self.problem = problem
+        self.walls = problem.walls
+        self.vectors = {(0, 1): Directions.NORTH, (0, -1): Directions.SOUTH,
+                        (1, 0): Directions.EAST, (-1, 0): Directions.WEST}
+
+    def getStartState(self):
+        return (self.problem.getStartState(), None)
+
+    def isGoalState(self, state):
+        return self.problem.isGoalState(state[0])
+
+    def getSuccessors(self, state):
+        (x, y), direction = state
+        walls = self.walls
+        if direction is None:
+            directions = [(0, 1), (0, -1), (1, 0), (-1, 0)]
+        elif direction[1] == 0:
+            # Horizontal moves may be followed by any move but a reversal
+            directions = [direction, (0, 1), (0, -1)]
+        else:
+            # Vertical moves only turn where the horizontal-first path is walled off
+            dy = direction[1]
+            directions = [direction] + [(dx, 0) for dx in (1, -1) if walls[x + dx][y - dy]]
+        successors = []
+        for dx, dy in directions:
+            jump = self.jump(x, y, dx, dy)
+            if jump is not None:
+                position, steps = jump
+                successors.append(((position, (dx, dy)), (self.vectors[(dx, dy)], steps), steps))
+        if '_expanded' in dir(self.problem): self.problem._expanded += 1
+        return successors
+
+    def jump(self, x, y, dx, dy):
+        """
+        Moves from (x, y) in direction (dx, dy) until reaching a jump point,
+        and returns (position, steps), or None if a wall comes first.
+        """
+        walls, isGoalState = self.walls, self.problem.isGoalState
+        steps = 0
+        while True:
+            x, y = x + dx, y + dy
+            steps += 1
+            if walls[x][y]:
+                return None
+            if isGoalState((x, y)):
+                return (x, y), steps
+            if dx == 0:
+                if (walls[x + 1][y - dy] and not walls[x + 1][y]) or \
+                   (walls[x - 1][y - dy] and not walls[x - 1][y]):
+                    return (x, y), steps
+            elif self.jump(x, y, 0, 1) is not None or self.jump(x, y, 0, -1) is not None:
+                return (x, y), steps
+
+    def getCostOfActions(self, actions):
+        return sum(steps for direction, steps in actions)
+
+def jumpPointSearch(problem, heuristic=nullHeuristic, stats=None):
+    """
+    A* over the jump point graph of a unit-cost grid problem (see
+    JumpPointProblem).  Returns the same optimal path cost as aStarSearch
+    with far fewer expansions on open layouts.  The heuristic is called
+    with grid positions, so manhattanHeuristic works as usual.
+    """
+    jumpProblem = JumpPointProblem(problem)
+    def jumpHeuristic(state, jumpProblem=None):
+        return heuristic(state[0], problem)
+
+    segments = aStarSearch(jumpProblem, jumpHeuristic, stats)
+    if segments is False:
+        return False
+    return [direction for direction, steps in segments for i in range(steps)]
+
+class ReversedProblem(SearchProblem):
+    """
+    The reverse of a single-goal problem that can list predecessors: it
+    starts at the goal, its successors are the original predecessors and its
+    goal is the original start.  The goal attribute is set to the original
+    start, so heuristics that read problem.goal (manhattanHeuristic, say)
+    estimate the distance back to the start.  Other attributes are read from
+    the original problem.
+    """
+    def __init__(self, problem):
+        self.problem = problem
+        self.goal = problem.getStartState()
+
+    def __getattr__(self, name):
+        return getattr(self.problem, name)
+
+    def getStartState(self):
+        return self.problem.getGoalState()
 
+    def isGoalState(self, state):
+        return state == self.goal
+
+    def getSuccessors(self, state):
+        return self.problem.getPredecessors(state)
+
+class _SearchFrontier:
+    "One side of a bidirectional search"
+    def __init__(self, problem, heuristic):
+        self.problem = problem
+        def priority_fun(node):
+            return node.totalCost + heuristic(node.state, problem)
+        self.fringe = util.BucketQueueWithFunction(priority_fun, nodeState)
+        self.priority = priority_fun
+        root = Node(problem.getStartState())
+        self.reached = {root.state: root}
+        self.closed = set()
+        self.fringe.push(root)
+
+def bidirectionalSearch(problem, heuristic=nullHeuristic, stats=None):
+    """
+    Searches forward from the start and backward from the goal at the same
+    time, always growing the smaller frontier, and stitches the two halves
+    together where they meet.  On a maze each side only explores about a ball
+    of half the solution's radius, instead of one ball of the full radius.
+
+    The problem must have a single goal and provide getGoalState() and
+    getPredecessors(state), which returns (predecessor, action, stepCost)
+    triples where action leads from predecessor to state.  Without a
+    heuristic this is bidirectional uniform cost search (bidirectional
+    breadth-first search for unit costs).  With a consistent heuristic both
+    sides run A*, the backward side on the ReversedProblem.
+    """
+    uniform = heuristic is nullHeuristic
+    if stats is not None:
+        stats.start()
+        heuristic = stats.timeHeuristic(heuristic)
+    if problem.getStartState() == problem.getGoalState():
+        if stats is not None: stats.stop([], 0)
+        return []
+
+    forward = _SearchFrontier(problem, heuristic)
+    backward = _SearchFrontier(ReversedProblem(problem), heuristic)
+    bestCost, meeting = float('inf'), None
+    lastCost = {forward: 0, backward: 0}
+    while not forward.fringe.isEmpty() and not backward.fringe.isEmpty():
+        if len(forward.fringe) <= len(backward.fringe):
+            side, other = forward, backward
+        else:
+            side, other = backward, forward
+        node = side.fringe.pop()
+        # Stop once no path through the open nodes can beat the best meeting
+        # found so far.  Without a heuristic both frontiers bound it; with one,
+        # the f value of either side does.
+        if uniform:
+            lastCost[side] = node.totalCost
+            if node.totalCost + lastCost[other] >= bestCost: break
+        elif side.priority(node) >= bestCost: break
+
+        side.closed.add(node.state)
+        successors = side.problem.getSuccessors(node.state)
+        for successor, action, stepCost in successors:
+            if successor in side.closed:
+                if stats is not None: stats.duplicatesSkipped += 1
+                continue
+            child = node.branch(successor, action, stepCost)
+            known = side.reached.get(successor)
+            if known is None or child.totalCost < known.totalCost:
+                side.reached[successor] = child
+                side.fringe.push(child)
+                known = child
+            otherNode = other.reached.get(successor)
+            if otherNode is not None and known.totalCost + otherNode.totalCost < bestCost:
+                bestCost = known.totalCost + otherNode.totalCost
+                if side is forward:
+                    meeting = (known, otherNode)
+                else:
+                    meeting = (otherNode, known)
+        if stats is not None:
+            stats.nodesExpanded += 1
+            stats.nodesGenerated += len(successors)
+            stats.fringeSize(len(forward.fringe) + len(backward.fringe))
+
+    if meeting is None:
+        if stats is not None: stats.stop()
+        return False
+    forwardNode, backwardNode = meeting
+    actions = forwardNode.getActions()
+    # Backward nodes store the action leading from their state to their parent's
+    while backwardNode.parent is not None:
+        actions.append(backwardNode.action)
+        backwardNode = backwardNode.parent
+    if stats is not None: stats.stop(actions, bestCost)
+    return actions
+
+def anytimeAStarSearch(problem, heuristic=nullHeuristic, timeLimit=1.0,
+                       initialWeight=3.0, weightStep=0.5, stats=None):
+    """
+    Anytime repairing A* (ARA*).  Runs weighted A* with f = g + weight * h,
+    which finds a first solution quickly, then lowers the weight by
+    weightStep and repairs the solution for as long as timeLimit seconds
+    allow, down to weight 1 (an optimal search for a consistent heuristic).
+
+    Each repair reuses the g values, parents and heuristic values of the
+    previous ones: only states whose g improved after they were expanded
+    (the INCONS list) are put back on the fringe, together with the old
+    fringe re-ranked under the new weight.
+
+    Returns the best solution found.  If the deadline passes before the
+    first solution is found the search carries on until it has one.
+    """
+    deadline = time.time() + timeLimit
+    if stats is not None:
+        stats.start()
+        heuristic = stats.timeHeuristic(heuristic)
+
+    start = problem.getStartState()
+    g = {start: 0}
+    parents = {start: None}
+    hValues = {}
+    def h(state):
+        if state not in hValues:
+            hValues[state] = heuristic(state, problem)
+        return hValues[state]
+
+    bestCost, bestGoal = float('inf'), None
+    if problem.isGoalState(start):
+        bestCost, bestGoal = 0, start
+    weight = max(initialWeight, 1.0)
+    fringe = util.IndexedPriorityQueue()
+    fringe.push(start, weight * h(start))
+    inconsistent = set()
+    while True:
+        # Weighted A* pass; closed only holds states expanded in this pass
+        closed = set()
+        expansions = 0
+        while not fringe.isEmpty():
+            if fringe.peekPriority() >= bestCost:
+                break
+            if bestGoal is not None and expansions % 100 == 0 and time.time() > deadline:
+                break
+            state = fringe.pop()
+            closed.add(state)
+            expansions += 1
+            successors = problem.getSuccessors(state)
+            for successor, action, stepCost in successors:
+                cost = g[state] + stepCost
+                if cost >= g.get(successor, float('inf')):
+                    if stats is not None: stats.duplicatesSkipped += 1
+                    continue
+                g[successor] = cost
+                parents[successor] = (state, action)
+                if problem.isGoalState(successor):
+                    if cost < bestCost:
+                        bestCost, bestGoal = cost, successor
+                    continue
+                if successor in closed:
+                    inconsistent.add(successor)
+                else:
+                    fringe.update(successor, cost + weight * h(successor))
+            if stats is not None:
+                stats.nodesExpanded += 1
+                stats.nodesGenerated += len(successors)
+                stats.fringeSize(len(fringe))
+
+        if bestGoal is None or weight <= 1.0 or time.time() > deadline:
+            break
+        # Lower the weight and re-rank the open and inconsistent states
+        weight = max(1.0, weight - weightStep)
+        states = fringe.items() + list(inconsistent)
+        fringe = util.IndexedPriorityQueue()
+        for state in states:
+            fringe.update(state, g[state] + weight * h(state))
+        inconsistent = set()
+
+    if bestGoal is None:
+        if stats is not None: stats.stop()
+        return False
+    actions = []
+    state = bestGoal
+    while parents[state] is not None:
+        state, action = parents[state]
+        actions.append(action)
+    actions.reverse()
+    if stats is not None: stats.stop(actions, bestCost)
+    return actions
+
+def frontierSearch(problem, stats=None, recentLayers=2, maxDepth=None):
+    """
+    Breadth-first frontier search: finds a path with the fewest actions
+    while keeping only the last recentLayers layers of the search in memory,
+    instead of every state ever expanded.
+
+    When each move can be undone (as in Pacman mazes and sliding puzzles)
+    a successor of a state d actions from the start is d-1, d or d+1 actions
+    away, so remembering the previous layer is enough to never expand a
+    state twice.  For other problems raise recentLayers, and set maxDepth
+    if the goal may be unreachable.
+
+    With no parent pointers to follow, the path is recovered by divide and
+    conquer.  The first search tags every state with its ancestor at a
+    power-of-two depth between a quarter and a half of its own, so the goal
+    arrives with a relay state on its path; the parts before and after the
+    relay are then solved by searches that tag every state from their
+    middle layer on with its ancestor there, and so on.  Memory stays
+    proportional to the widest layer, but each of the about log2(depth)
+    levels of that recursion searches again around the whole path.  Where
+    the last layers do not dominate the search, as in mazes, that is several
+    times the expansions of breadthFirstSearch: 4-9 times on mediumMaze,
+    openMaze, bigMaze and generated 21x21 to 81x81 mazes.
+    """
+    if stats is not None:
+        stats.start()
+    start = problem.getStartState()
+    found = _frontierLayers(problem, start, problem.isGoalState, maxDepth, None, recentLayers, stats)
+    if found is None:
+        if stats is not None: stats.stop()
+        return False
+    depth, goal, relay = found
+    relayDepth = (1 << depth.bit_length() - 1) // 2
+    actions = (_frontierPath(problem, start, relay, relayDepth, recentLayers, stats) +
+               _frontierPath(problem, relay, goal, depth - relayDepth, recentLayers, stats))
+    if stats is not None: stats.stop(actions, problem.getCostOfActions(actions))
+    return actions
+
+def _frontierLayers(problem, start, isGoal, maxDepth, relayDepth, recentLayers, stats):
+    """
+    One breadth-first frontier search from start.  Returns (depth, goal,
+    relay) for the first state passing isGoal, where relay is its ancestor
+    relayDepth actions from start, or None if there is no goal within
+    maxDepth.  With relayDepth None, relay is its ancestor at depth P / 2
+    for the largest power of two P not above the goal's depth.
+    """
+    # Each state maps to (relay, next relay): with relayDepth None, its
+    # ancestors at the last two power-of-two depths not above its own
+    layer = {start: (start if relayDepth in (0, None) else None, start)}
+    if isGoal(start):
+        return 0, start, layer[start][0]
+    older = []  # the recentLayers - 1 layers before layer
+    depth = 0
+    while layer and (maxDepth is None or depth < maxDepth):
+        depth += 1
+        doubled = relayDepth is None and depth & (depth - 1) == 0
+        nextLayer = {}
+        for state, (relay, nextRelay) in layer.iteritems():
+            successors = problem.getSuccessors(state)
+            if stats is not None:
+                stats.nodesExpanded += 1
+                stats.nodesGenerated += len(successors)
+            for successor, action, stepCost in successors:
+                if successor in nextLayer or successor in layer or [1 for seen in older if successor in seen]:
+                    if stats is not None: stats.duplicatesSkipped += 1
+                    continue
+                if doubled:
+                    nextLayer[successor] = (nextRelay, successor)
+                elif depth == relayDepth:
+                    nextLayer[successor] = (successor, None)
+                else:
+                    nextLayer[successor] = (relay, nextRelay)
+                if isGoal(successor):
+                    return depth, successor, nextLayer[successor][0]
+        if stats is not None:
+            stats.fringeSize(len(nextLayer) + len(layer) + sum([len(seen) for seen in older]))
+        older.append(layer)
+        if len(older) >= recentLayers:
+            del older[0]
+        layer = nextLayer
+    return None
+
+def _frontierPath(problem, start, goal, depth, recentLayers, stats):
+    "The actions of a shortest path from start to goal, which is depth actions away"
+    if depth == 0:
+        return []
+    if depth == 1:
+        for successor, action, stepCost in problem.getSuccessors(start):
+            if successor == goal:
+                return [action]
+    middle = depth // 2
+    found = _frontierLayers(problem, start, lambda state: state == goal, depth, middle, recentLayers, stats)
+    relay = found[2]
+    return (_frontierPath(problem, start, relay, middle, recentLayers, stats) +
+            _frontierPath(problem, relay, goal, depth - middle, recentLayers, stats))
+
+
+# Batches of problems
+
+# Problem specs are small picklable tuples (kind, arguments...) that name a
+# problem instead of holding one, so they can be shipped to other processes.
+# PROBLEM_SPECS maps each kind to the dotted name of a function that builds
+# the problem from the arguments.
+PROBLEM_SPECS = {
+    'position': 'searchAgents.positionSearchProblemFromSpec',     # (layout, start, goal)
+    'corners': 'searchAgents.cornersProblemFromSpec',             # (layout,)
+    'eightpuzzle': 'eightpuzzle.eightPuzzleSearchProblemFromSpec', # (numbers,)
+}
+
+def _resolveName(name, module):
+    "Looks up a dotted name, or a plain name in module"
+    if '.' in name:
+        module, name = name.rsplit('.', 1)
+    return getattr(__import__(module), name)
+
+def _solveSpec(index, spec, fn, heuristic):
+    """
+    Builds and solves one problem spec, returning its result dictionary.
+    Errors are returned rather than raised, so that one bad spec cannot
+    stall a whole batch.
+    """
+    result = {'index': index, 'spec': spec}
+    try:
+        builder = PROBLEM_SPECS[spec[0]]
+        problem = _resolveName(builder, None)(*spec[1:])
+        function = _resolveName(fn, 'search')
+        stats = SearchStatistics('%s %s' % (fn, spec[0]))
+        if heuristic is None:
+            actions = function(problem, stats=stats)
+        else:
+            actions = function(problem, _resolveName(heuristic, builder.split('.')[0]), stats=stats)
+        result.update(stats.asDict())
+        result['actions'] = actions
+    except Exception, e:
+        result['error'] = '%s: %s' % (e.__class__.__name__, e)
+    return result
+
+_startedChunks = None  # in pool workers, where _solveSpecs reports the chunks it takes
+
+def _initWorker(started):
+    global _startedChunks
+    _startedChunks = started
+
+def _solveSpecs(chunk, fn, heuristic):
+    if _startedChunks is not None:
+        _startedChunks.put((chunk[0][0], os.getpid()))
+    return [_solveSpec(index, spec, fn, heuristic) for index, spec in chunk]
+
+def _chunkErrors(chunk, error):
+    return [{'index': index, 'spec': spec, 'error': error} for index, spec in chunk]
+
+def _finishedChunks(pending, started, owners):
+    """
+    Waits until some of the (chunk, AsyncResult) pairs in pending are done,
+    removes them and returns their results.  A chunk whose worker raised
+    outside _solveSpec (an unpicklable result, say) or died while solving
+    it (run out of memory, say) gets an error result for each of its specs
+    instead of stalling the batch.  owners maps the first index of a chunk
+    to the worker process that took it, as reported on started.
+    """
+    while True:
+        while not started.empty():
+            first, pid = started.get()
+            owners[first] = pid
+        alive = set([process.pid for process in multiprocessing.active_children()])
+        results = []
+        for entry in list(pending):
+            chunk, asyncResult = entry
+            owner = owners.get(chunk[0][0])
+            if asyncResult.ready():
+                try:
+                    results.extend(asyncResult.get())
+                except Exception, e:
+                    results.extend(_chunkErrors(chunk, '%s: %s' % (e.__class__.__name__, e)))
+            elif owner is not None and owner not in alive:
+                results.extend(_chunkErrors(chunk, 'worker process %d died' % owner))
+            else:
+                continue
+            pending.remove(entry)
+            owners.pop(chunk[0][0], None)
+        if results:
+            return results
+        pending[0][1].wait(0.1)  # a timeout keeps Ctrl-C working
+
+def solveMany(specs, fn='bfs', heuristic=None, workers=None, maxPending=None, chunkSize=8):
+    """
+    Solves every problem spec in specs with the search function named fn
+    (and the heuristic named heuristic, looked up in the module of the
+    problem's builder), yielding one result dictionary per spec.
+
+    The specs are spread over a multiprocessing pool of workers processes
+    (one per CPU by default; workers=1 solves them in this process) and the
+    results come back in the order they finish, not the order of specs.
+    Each result has the spec and its index in specs, the SearchStatistics
+    counters and the actions found, or an 'error' entry.  Specs are sent to
+    the workers chunkSize at a time to save on messages.  specs may be any
+    iterable: at most maxPending chunks (8 per worker by default) are in
+    flight at a time, so memory stays bounded however many there are.
+
+      >>> specs = [('position', 'mediumMaze', None, (1, 1)), ('corners', 'tinyCorners')]
+      >>> for result in solveMany(specs, 'astar', 'manhattanHeuristic', workers=2): ...
+    """
+    if workers is None:
+        workers = multiprocessing.cpu_count()
+    if workers <= 1:
+        for index, spec in enumerate(specs):
+            yield _solveSpec(index, spec, fn, heuristic)
+        return
+    if maxPending is None:
+        maxPending = 8 * workers
+
+    started = multiprocessing.queues.SimpleQueue()
+    pool = multiprocessing.Pool(workers, _initWorker, (started,))
+    pending = []  # (chunk, AsyncResult) for every chunk sent to the pool
+    owners = {}
+    chunk = []
+    try:
+        for index, spec in enumerate(specs):
+            chunk.append((index, spec))
+            if len(chunk) < chunkSize:
+                continue
+            pending.append((chunk, pool.apply_async(_solveSpecs, (chunk, fn, heuristic))))
+            chunk = []
+            while len(pending) >= maxPending:
+                for result in _finishedChunks(pending, started, owners):
+                    yield result
+        if chunk:
+            pending.append((chunk, pool.apply_async(_solveSpecs, (chunk, fn, heuristic))))
+        while pending:
+            for result in _finishedChunks(pending, started, owners):
+                yield result
+        pool.close()
+    finally:
+        pool.terminate()
+        pool.join()
 
 # Abbreviations
 bfs = breadthFirstSearch
 dfs = depthFirstSearch
 astar = aStarSearch
 ucs = uniformCostSearch
+idastar = idaStarSearch
+jps = jumpPointSearch
+bidirectional = bidirectionalSearch
+arastar = anytimeAStarSearch
+frontier = frontierSearch
+lazyastar = lazyAStarSearch
@@ -35,7 +35,12 @@ from game import Agent
 from game import Actions
 import util
 import time
+import cPickle
+import hashlib
 import search
+import mazeDistances
+import junctionGraph
+import landmarks
 
 class GoWestAgent(Agent):
     "An agent that goes West until it can't."
@@ -62,18 +67,30 @@ class SearchAgent(Agent):
     Options for fn include:
       depthFirstSearch or dfs
       breadthFirstSearch or bfs
+      idaStarSearch or idastar (takes a heuristic, like aStarSearch)
 
+    Passing stats=FILE (e.g. -a fn=astar,stats=run.json) appends the
+    search.SearchStatistics of the run to FILE as one line of JSON; use
+    stats=- to print them instead.  Passing junctions (-a fn=ucs,junctions)
+    runs the search on the corridor-contracted junction graph of the layout
+    (see junctionSearchProblem).  Its edges have different lengths, so use
+    ucs or astar there for optimal paths.
 
     Note: You should NOT change any code in SearchAgent
     """
 
-    def __init__(self, fn='depthFirstSearch', prob='PositionSearchProblem', heuristic='nullHeuristic'):
+    def __init__(self, fn='depthFirstSearch', prob='PositionSearchProblem', heuristic='nullHeuristic', stats=None, junctions=None):
         # Warning: some advanced Python magic is employed below to find the right functions and problems
 
         # Get the search function from the name and heuristic
         if fn not in dir(search):
             raise AttributeError, fn + ' is not a search function in search.py.'
         func = getattr(search, fn)
+        if stats != None and 'stats' not in func.func_code.co_varnames:
+            raise AttributeError, fn + ' does not record search statistics.'
+        self.statsFile = stats
+        self.junctions = junctions != None
+        self.statsLabel = ' '.join([fn, prob, heuristic])
         if 'heuristic' not in func.func_code.co_varnames:
             print('[SearchAgent] using function ' + fn)
             self.searchFunction = func
@@ -86,7 +103,7 @@ class SearchAgent(Agent):
                 raise AttributeError, heuristic + ' is not a function in searchAgents.py or search.py.'
             print('[SearchAgent] using function %s and heuristic %s' % (fn, heuristic))
             # Note: this bit of Python trickery combines the search algorithm and the heuristic
-            self.searchFunction = lambda x: func(x, heuristic=heur)
+            self.searchFunction = lambda x, **kwargs: func(x, heuristic=heur, **kwargs)
 
         # Get the search problem type from the name
         if prob not in globals().keys() or not prob.endswith('Problem'):
@@ -105,10 +122,21 @@ class SearchAgent(Agent):
         if self.searchFunction == None: raise Exception, "No search function provided for SearchAgent"
         starttime = time.time()
         problem = self.searchType(state) # Makes a new search problem
-        self.actions  = self.searchFunction(problem) # Find a path
+        searchProblem = problem
+        if getattr(self, 'junctions', False):
+            searchProblem = junctionSearchProblem(problem)
+        statsFile = getattr(self, 'statsFile', None)
+        if statsFile != None:
+            stats = search.SearchStatistics(self.statsLabel)
+            self.actions = self.searchFunction(searchProblem, stats=stats) # Find a path
+        else:
+            self.actions  = self.searchFunction(searchProblem) # Find a path
+        if searchProblem is not problem:
+            self.actions = junctionGraph.expandActions(self.actions)
         totalCost = problem.getCostOfActions(self.actions)
         print('Path found with total cost of %d in %.1f seconds' % (totalCost, time.time() - starttime))
         if '_expanded' in dir(problem): print('Search nodes expanded: %d' % problem._expanded)
+        if statsFile != None: stats.dump(statsFile)
 
     def getAction(self, state):
         """
@@ -125,6 +153,69 @@ class SearchAgent(Agent):
         else:
             return Directions.STOP
 
+def unitCost(position):
+    "The default cost function of a PositionSearchProblem: every step costs 1"
+    return 1
+
+def displayIsActive():
+    "Returns whether pacman.py is showing a display that can draw expanded cells"
+    import __main__
+    return hasattr(getattr(__main__, '_display', None), 'drawExpandedCells')
+
+_MOVE_VECTORS = tuple([(action, tuple(map(int, Actions.directionToVector(action))))
+                       for action in [Directions.NORTH, Directions.SOUTH, Directions.EAST, Directions.WEST]])
+
+def _movesFrom(walls, cell):
+    "Returns the (neighbour, action) pairs of an open cell, north, south, east, west"
+    x, y = cell
+    moves = []
+    for action, (dx, dy) in _MOVE_VECTORS:
+        if not walls[x + dx][y + dy]:
+            moves.append(((x + dx, y + dy), action))
+    return tuple(moves)
+
+class _NeighbourTable(dict):
+    "The (neighbour, action) pairs of each open cell, filled in as cells are looked up"
+    def __init__(self, walls):
+        dict.__init__(self)
+        self.walls = walls
+
+    def __missing__(self, cell):
+        moves = self[cell] = _movesFrom(self.walls, cell)
+        return moves
+
+class _UnitSuccessorTable(dict):
+    "The (neighbour, action, 1) triples of each open cell, filled in as cells are looked up"
+    def __init__(self, neighbours):
+        dict.__init__(self)
+        self.neighbours = neighbours
+
+    def __missing__(self, cell):
+        successors = self[cell] = tuple([(n, action, 1) for n, action in self.neighbours[cell]])
+        return successors
+
+# Largest board (width * height) that gets getNeighbourTables.  The tables
+# grow with the cells searched, so bigger boards compute moves from the walls.
+NEIGHBOUR_TABLE_CELLS = 100 * 100
+
+_neighbourTables = {}  # id(walls) -> (walls, tables)
+
+def getNeighbourTables(walls):
+    """
+    Returns two dictionaries for a wall Grid, shared by every problem on the
+    layout: one from each open cell to its (neighbour, action) pairs, and
+    one to its (neighbour, action, 1) successor triples.  Both list moves in
+    the order north, south, east, west, as PositionSearchProblem.getSuccessors
+    does, and a cell's entries are only computed the first time it is looked
+    up, so a short search on a big board stays cheap.
+    """
+    entry = _neighbourTables.get(id(walls))
+    if entry is None or entry[0] is not walls:
+        neighbours = _NeighbourTable(walls)
+        entry = (walls, (neighbours, _UnitSuccessorTable(neighbours)))
+        _neighbourTables[id(walls)] = entry
+    return entry[1]
+
 class PositionSearchProblem(search.SearchProblem):
     """
     A search problem defines the state space, start state, goal test,
@@ -136,7 +227,7 @@ class PositionSearchProblem(search.SearchProblem):
     Note: this search problem is fully specified; you should NOT change it.
     """
 
-    def __init__(self, gameState, costFn = lambda x: 1, goal=(1,1), start=None, warn=True, visualize=True):
+    def __init__(self, gameState, costFn = unitCost, goal=(1,1), start=None, warn=True, visualize=True):
         """
         Stores the start and goal.
 
@@ -155,12 +246,26 @@ class PositionSearchProblem(search.SearchProblem):
 
         # For display purposes
         self._visited, self._visitedlist, self._expanded = {}, [], 0
+        self._setHeadless(not (visualize and displayIsActive()))
+
+    def _setHeadless(self, headless):
+        """
+        With no display to draw the expanded cells, skips the _visited
+        bookkeeping and, on boards up to NEIGHBOUR_TABLE_CELLS, reads
+        successors from the layout's neighbour tables.
+        """
+        self.headless = headless
+        self._neighbours = self._unitSuccessors = None
+        if headless and self.walls.width * self.walls.height <= NEIGHBOUR_TABLE_CELLS:
+            self._neighbours, self._unitSuccessors = getNeighbourTables(self.walls)
 
     def getStartState(self):
         return self.startState
 
     def isGoalState(self, state):
         isGoal = state == self.goal
+        if self.headless:
+            return isGoal
 
         # For display purposes only
         if isGoal and self.visualize:
@@ -184,6 +289,17 @@ class PositionSearchProblem(search.SearchProblem):
          cost of expanding to that successor
         """
 
+        if self.headless:
+            self._expanded += 1
+            if self._neighbours is None:
+                moves = _movesFrom(self.walls, state)
+            elif self.costFn is unitCost:
+                return list(self._unitSuccessors[state])
+            else:
+                moves = self._neighbours[state]
+            costFn = self.costFn
+            return [(nextState, action, costFn(nextState)) for nextState, action in moves]
+
         successors = []
         for action in [Directions.NORTH, Directions.SOUTH, Directions.EAST, Directions.WEST]:
             x,y = state
@@ -202,6 +318,33 @@ class PositionSearchProblem(search.SearchProblem):
 
         return successors
 
+    def getGoalState(self):
+        return self.goal
+
+    def getPredecessors(self, state):
+        """
+        Returns the (predecessor, action, stepCost) triples of the positions
+        that lead to state, for bidirectional search.  Moves are reversible,
+        so these are the neighbours of state, with the action that steps from
+        each of them into state and the cost of entering state.
+        """
+        predecessors = []
+        x,y = state
+        cost = self.costFn(state)
+        for action in [Directions.NORTH, Directions.SOUTH, Directions.EAST, Directions.WEST]:
+            dx, dy = Actions.directionToVector(action)
+            prevx, prevy = int(x - dx), int(y - dy)
+            if not self.walls[prevx][prevy]:
+                predecessors.append( ( (prevx, prevy), action, cost) )
+
+        # Bookkeeping for display purposes
+        self._expanded += 1
+        if not self.headless and state not in self._visited:
+            self._visited[state] = True
+            self._visitedlist.append(state)
+
+        return predecessors
+
     def getCostOfActions(self, actions):
         """
         Returns the cost of a particular sequence of actions.  If those actions
@@ -242,6 +385,29 @@ class StayWestSearchAgent(SearchAgent):
         costFn = lambda pos: 2 ** pos[0]
         self.searchType = lambda state: PositionSearchProblem(state, costFn)
 
+_specStates = {}  # layout name -> GameState, for building problems from specs
+
+def _specGameState(layoutName):
+    if layoutName not in _specStates:
+        import layout, pacman
+        gameState = pacman.GameState()
+        gameState.initialize(layout.getLayout(layoutName), 0)
+        _specStates[layoutName] = gameState
+    return _specStates[layoutName]
+
+def positionSearchProblemFromSpec(layoutName, start=None, goal=(1, 1)):
+    """
+    Builds a PositionSearchProblem on the named layout, for search.solveMany.
+    start defaults to Pacman's position in the layout.
+    """
+    if start is not None: start = tuple(start)
+    return PositionSearchProblem(_specGameState(layoutName), start=start, goal=tuple(goal),
+                                 warn=False, visualize=False)
+
+def cornersProblemFromSpec(layoutName):
+    "Builds the CornersProblem of the named layout, for search.solveMany"
+    return CornersProblem(_specGameState(layoutName))
+
 def manhattanHeuristic(position, problem, info={}):
     "The Manhattan distance heuristic for a PositionSearchProblem"
     xy1 = position
@@ -254,38 +420,45 @@ def euclideanHeuristic(position, problem, info={}):
     xy2 = problem.goal
     return ( (xy1[0] - xy2[0]) ** 2 + (xy1[1] - xy2[1]) ** 2 ) ** 0.5
 
-#####################################################
-# This portion is incomplete.  Time to write code!  #
-#####################################################
-class CornerState:
-    def __init__(self, pacmanPosition, corners, visited=None):
-        self.corners = corners
-        self.pacmanPosition = pacmanPosition
-        if not visited:
-            self.visited = {key: False for key in self.corners}
+def altHeuristic(position, problem, info={}):
+    """
+    The landmark (ALT) heuristic for a PositionSearchProblem or
+    AnyFoodSearchProblem: a lower bound on the maze distance to the goal (or
+    to the nearest food) from the layout's landmark tables in landmarks.py.
+    Admissible and consistent, and much tighter than the Manhattan distance
+    in winding mazes.
+    """
+    bound = getattr(problem, 'landmarkBound', None)
+    if bound is None:
+        if isinstance(problem, AnyFoodSearchProblem):
+            targets = problem.food.asList()
         else:
-            self.visited = visited.copy()
-
-        if self.visited.has_key(pacmanPosition):
-            self.visited[pacmanPosition] = True
-
-    def __eq__(self, other):
-        if isinstance(other, CornerState):
-            return self.pacmanPosition == other.pacmanPosition and self.visited == other.visited
-        return False
-
-    def __hash__(self):
-        return hash(self.pacmanPosition) ^ hash(frozenset(self.visited.items()))
-
-    def getSuccessor(self, nextPacmanPosition):
-        return CornerState(nextPacmanPosition, self.corners, self.visited)
+            targets = [problem.goal]
+        bound = landmarks.getLandmarks(problem.walls).targetBound(targets)
+        problem.landmarkBound = bound
+    return bound(position)
 
+def mazeDistanceBound(walls):
+    """
+    Returns a function (p, q) -> lower bound on the maze distance between two
+    open cells, for use in heuristics.  Boards small enough for an all-pairs
+    table (see MAZE_DISTANCE_TABLE_CELLS) get exact distances, bigger ones the
+    landmark bounds.
+    """
+    if fitsMazeDistanceTable(walls):
+        return mazeDistances.getMazeDistances(walls).distance
+    return landmarks.getLandmarks(walls).lowerBound
 
+#####################################################
+# This portion is incomplete.  Time to write code!  #
+#####################################################
 class CornersProblem(search.SearchProblem):
     """
     This search problem finds paths through all four corners of a layout.
 
-    You must select a suitable state space and successor function
+    A search state is a tuple ( pacmanPosition, cornerMask ) where bit i of
+    cornerMask is set if corners[i] has not been visited yet, as with the
+    foodMask of FoodSearchProblem.
     """
 
     def __init__(self, startingGameState):
@@ -303,7 +476,9 @@ class CornersProblem(search.SearchProblem):
         # Please add any code here which you would like to use
         # in initializing the problem
 
-        self.startState = CornerState(self.startingPosition, self.corners)
+        self.cornerBits = dict((corner, 1 << i) for i, corner in enumerate(self.corners))
+        allCorners = (1 << len(self.corners)) - 1
+        self.startState = (self.startingPosition, allCorners & ~self.cornerBits.get(self.startingPosition, 0))
 
     def getStartState(self):
         "Returns the start state (in your state space, not the full Pacman state space)"
@@ -311,10 +486,11 @@ class CornersProblem(search.SearchProblem):
 
     def isGoalState(self, state):
         "Returns whether this search state is a goal state of the problem"
-        for value in state.visited.values():
-            if not value:
-                return False
-        return True
+        return state[1] == 0
+
+    def moveTo(self, state, position):
+        "Returns the state after Pacman walks from state to position"
+        return (position, state[1] & ~self.cornerBits.get(position, 0))
 
     def getSuccessors(self, state):
         """
@@ -329,6 +505,7 @@ class CornersProblem(search.SearchProblem):
         """
 
         successors = []
+        cornerMask = state[1]
         for action in [Directions.NORTH, Directions.SOUTH, Directions.EAST, Directions.WEST]:
             # Add a successor state to the successor list if the action is legal
             # Here's a code snippet for figuring out whether a new position hits a wall:
@@ -336,13 +513,13 @@ class CornersProblem(search.SearchProblem):
             #   dx, dy = Actions.directionToVector(action)
             #   nextx, nexty = int(x + dx), int(y + dy)
             #   hitsWall = self.walls[nextx][nexty]
-            x,y = state.pacmanPosition
+            x,y = state[0]
             dx, dy = Actions.directionToVector(action)
             nextx, nexty = int(x + dx), int(y + dy)
             hitsWall = self.walls[nextx][nexty]
             if not hitsWall:
-                newstate = state.getSuccessor((nextx, nexty))
-                successors.append((newstate, action,1))
+                nextCorners = cornerMask & ~self.cornerBits.get((nextx, nexty), 0)
+                successors.append((((nextx, nexty), nextCorners), action, 1))
 
         self._expanded += 1
         return successors
@@ -377,12 +554,14 @@ def cornersHeuristic(state, problem):
     corners = problem.corners # These are the corner coordinates
     walls = problem.walls # These are the walls of the maze, as a Grid (game.py)
 
-    values = [0]
-    for (corner, visited) in state.visited.items():
-        if not visited:
-            values.append(util.manhattanDistance(corner, state.pacmanPosition))
-
-    return max(values)
+    # The farthest unvisited corner still has to be reached
+    distance = mazeDistanceBound(walls)
+    position, cornerMask = state
+    best = 0
+    for i, corner in enumerate(corners):
+        if cornerMask >> i & 1:
+            best = max(best, util.manhattanDistance(corner, position), distance(position, corner))
+    return best
 
 class AStarCornersAgent(SearchAgent):
     "A SearchAgent for FoodSearchProblem using A* and your foodHeuristic"
@@ -395,12 +574,19 @@ class FoodSearchProblem:
     A search problem associated with finding the a path that collects all of the
     food (dots) in a Pacman game.
 
-    A search state in this problem is a tuple ( pacmanPosition, foodGrid ) where
+    A search state in this problem is a tuple ( pacmanPosition, foodMask ) where
       pacmanPosition: a tuple (x,y) of integers specifying Pacman's position
-      foodGrid:       a Grid (see game.py) of either True or False, specifying remaining food
+      foodMask:       an int with bit i set if the food at foodPositions[i] remains
+
+    Keeping the food as a bitmask makes successors and state hashing O(1)
+    instead of copying and scanning a whole Grid.  Use getFoodPositions(foodMask)
+    or getFoodGrid(foodMask) to get the remaining food back.
     """
     def __init__(self, startingGameState):
-        self.start = (startingGameState.getPacmanPosition(), startingGameState.getFood())
+        food = startingGameState.getFood()
+        self.foodPositions = tuple(food.asList())
+        self.foodBits = dict((pos, 1 << i) for i, pos in enumerate(self.foodPositions))
+        self.start = (startingGameState.getPacmanPosition(), (1 << len(self.foodPositions)) - 1)
         self.walls = startingGameState.getWalls()
         self.startingGameState = startingGameState
         self._expanded = 0
@@ -410,22 +596,33 @@ class FoodSearchProblem:
         return self.start
 
     def isGoalState(self, state):
-        return state[1].count() == 0
+        return state[1] == 0
 
     def getSuccessors(self, state):
         "Returns successor states, the actions they require, and a cost of 1."
         successors = []
         self._expanded += 1
+        foodMask = state[1]
         for direction in [Directions.NORTH, Directions.SOUTH, Directions.EAST, Directions.WEST]:
             x,y = state[0]
             dx, dy = Actions.directionToVector(direction)
             nextx, nexty = int(x + dx), int(y + dy)
             if not self.walls[nextx][nexty]:
-                nextFood = state[1].copy()
-                nextFood[nextx][nexty] = False
+                nextFood = foodMask & ~self.foodBits.get((nextx, nexty), 0)
                 successors.append( ( ((nextx, nexty), nextFood), direction, 1) )
         return successors
 
+    def getFoodPositions(self, foodMask):
+        "Returns the list of food positions that remain in foodMask"
+        return [pos for i, pos in enumerate(self.foodPositions) if foodMask >> i & 1]
+
+    def getFoodGrid(self, foodMask):
+        "Returns the food that remains in foodMask as a Grid"
+        grid = self.startingGameState.getFood().copy()
+        for i, (x, y) in enumerate(self.foodPositions):
+            grid[x][y] = bool(foodMask >> i & 1)
+        return grid
+
     def getCostOfActions(self, actions):
         """Returns the cost of a particular sequence of actions.  If those actions
         include an illegal move, return 999999"""
@@ -446,6 +643,83 @@ class AStarFoodSearchAgent(SearchAgent):
         self.searchFunction = lambda prob: search.aStarSearch(prob, foodHeuristic)
         self.searchType = FoodSearchProblem
 
+# Most dots heldKarpFoodSearch accepts; its tables have 2^n * n entries
+HELD_KARP_FOOD_LIMIT = 16
+
+def heldKarpFoodSearch(problem):
+    """
+    Finds an optimal path through all the food of a FoodSearchProblem by
+    dynamic programming over subsets of the dots (the Held-Karp algorithm),
+    instead of searching positions times food grids.  A* with foodHeuristic
+    is faster on the course layouts; this is an exact reference to check
+    it against (HeldKarpFoodSearchAgent runs it from pacman.py).
+
+    best[mask * n + i] is the length of the shortest walk from Pacman that
+    visits exactly the dots in mask and ends at dot i.  The optimal visiting
+    order is expanded back into actions one leg at a time.  Returns False if
+    some dot cannot be reached, and raises ValueError for more than
+    HELD_KARP_FOOD_LIMIT dots.
+    """
+    position, foodMask = problem.getStartState()
+    food = problem.getFoodPositions(foodMask)
+    if not food:
+        return []
+    n = len(food)
+    if n > HELD_KARP_FOOD_LIMIT:
+        raise ValueError('heldKarpFoodSearch handles at most %d dots, not %d'
+                         % (HELD_KARP_FOOD_LIMIT, n))
+    walls = problem.walls
+    infinity = float('inf')
+    if fitsMazeDistanceTable(walls):
+        distance = mazeDistances.getMazeDistances(walls).distance
+    else:
+        fields = dict((cell, mazeDistances.distancesFrom(walls, cell)) for cell in [position] + food)
+        distance = lambda p, q: fields[p].get(q, infinity)
+    fromStart = [distance(position, dot) for dot in food]
+    if infinity in fromStart:
+        return False
+    legs = [[distance(dot, other) for other in food] for dot in food]
+
+    full = (1 << n) - 1
+    best = [infinity] * ((full + 1) * n)
+    previous = [None] * ((full + 1) * n)
+    bits = [(i, 1 << i) for i in range(n)]
+    for i, bit in bits:
+        best[bit * n + i] = fromStart[i]
+    for mask in xrange(1, full):
+        base = mask * n
+        ends = [(i, best[base + i]) for i, bit in bits if mask & bit]
+        for j, bit in bits:
+            if mask & bit:
+                continue
+            toJ = legs[j]
+            cost, via = min((cost + toJ[i], i) for i, cost in ends)
+            slot = (mask | bit) * n + j
+            best[slot], previous[slot] = cost, via
+
+    # Walk the optimal order back from its last dot
+    base = full * n
+    last = min(range(n), key=lambda i: best[base + i])
+    order, mask = [], full
+    while last is not None:
+        order.append(food[last])
+        last, mask = previous[mask * n + last], mask & ~(1 << last)
+    order.reverse()
+
+    actions = []
+    for target in order:
+        leg = PositionSearchProblem(problem.startingGameState, start=position, goal=target,
+                                    warn=False, visualize=False)
+        actions += search.breadthFirstSearch(leg)
+        position = target
+    return actions
+
+class HeldKarpFoodSearchAgent(SearchAgent):
+    "A SearchAgent for FoodSearchProblem using the exact heldKarpFoodSearch solver"
+    def __init__(self):
+        self.searchFunction = heldKarpFoodSearch
+        self.searchType = FoodSearchProblem
+
 def foodHeuristic(state, problem):
     """
     Your heuristic for the FoodSearchProblem goes here.
@@ -458,9 +732,10 @@ def foodHeuristic(state, problem):
     your heuristic is *not* consistent, and probably not admissible!  On the other hand,
     inadmissible or inconsistent heuristics may find optimal solutions, so be careful.
 
-    The state is a tuple ( pacmanPosition, foodGrid ) where foodGrid is a
-    Grid (see game.py) of either True or False. You can call foodGrid.asList()
-    to get a list of food coordinates instead.
+    The state is a tuple ( pacmanPosition, foodMask ) where foodMask is an int
+    bitmask over problem.foodPositions. You can call
+    problem.getFoodPositions(foodMask) to get a list of food coordinates, or
+    problem.getFoodGrid(foodMask) for a Grid (see game.py).
 
     If you want access to info like walls, capsules, etc., you can query the problem.
     For example, problem.walls gives you a Grid of where the walls are.
@@ -471,28 +746,80 @@ def foodHeuristic(state, problem):
       problem.heuristicInfo['wallCount'] = problem.walls.count()
     Subsequent calls to this heuristic can access problem.heuristicInfo['wallCount']
     """
-    position, foodGrid = state
-
-    # get max and min point
-    x_points, y_points = zip(*(foodGrid.asList() + [position]))
-    return util.manhattanDistance((max(x_points), max(y_points)), (min(x_points), min(y_points)))
+    position, foodMask = state
+    if foodMask == 0:
+        return 0
+
+    # Any path that eats all the food has to reach some dot first, and then
+    # visit the others, which costs at least their minimum spanning tree
+    # under maze distance.  Both parts use the same maze distance bound
+    # (exact on all but huge boards), which keeps the sum consistent.
+    info = problem.heuristicInfo
+    if 'foodDistances' not in info:
+        distance = mazeDistanceBound(problem.walls)
+        info['mazeDistance'] = distance
+        info['foodDistances'] = [[distance(p, q) for q in problem.foodPositions]
+                                 for p in problem.foodPositions]
+        info['spanningTrees'] = util.LRUCache(FOOD_HEURISTIC_CACHE_SIZE)
+    distance = info['mazeDistance']
+
+    food = [i for i in range(len(problem.foodPositions)) if foodMask >> i & 1]
+    nearest = min(distance(position, problem.foodPositions[i]) for i in food)
+    treeCost = info['spanningTrees'].get(foodMask)
+    if treeCost is None:
+        treeCost = spanningTreeCost(food, info['foodDistances'])
+        info['spanningTrees'][foodMask] = treeCost
+    return nearest + treeCost
+
+FOOD_HEURISTIC_CACHE_SIZE = 1 << 16
+
+def spanningTreeCost(nodes, distances):
+    """
+    Returns the weight of a minimum spanning tree over nodes (indices into the
+    square matrix distances), using Prim's algorithm.
+    """
+    if not nodes:
+        return 0
+    best = dict((node, distances[nodes[0]][node]) for node in nodes[1:])
+    cost = 0
+    while best:
+        node = min(best, key=best.get)
+        cost += best.pop(node)
+        row = distances[node]
+        for other in best:
+            if row[other] < best[other]:
+                best[other] = row[other]
+    return cost
 
 class ClosestDotSearchAgent(SearchAgent):
-    "Search for all food using a sequence of searches"
+    """
+    Search for all food using a sequence of searches.  The legs are planned
+    with closestDotPlan, or with one findPathToClosestDot search per dot on
+    the junction graph of the layout when junctions is passed
+    (-a junctions).
+    """
     def registerInitialState(self, state):
-        self.actions = []
+        if getattr(self, 'junctions', False):
+            self.actions = self.searchDotByDot(state)
+        else:
+            self.actions = closestDotPlan(state)
+        self.actionIndex = 0
+        print 'Path found with cost %d.' % len(self.actions)
+
+    def searchDotByDot(self, state):
+        "Returns the actions of one findPathToClosestDot search per dot, from state"
+        actions = []
         currentState = state
         while(currentState.getFood().count() > 0):
             nextPathSegment = self.findPathToClosestDot(currentState) # The missing piece
-            self.actions += nextPathSegment
+            actions += nextPathSegment
             for action in nextPathSegment:
                 legal = currentState.getLegalActions()
                 if action not in legal:
                     t = (str(action), str(currentState))
                     raise Exception, 'findPathToClosestDot returned an illegal move: %s!\n%s' % t
                 currentState = currentState.generateSuccessor(0, action)
-        self.actionIndex = 0
-        print 'Path found with cost %d.' % len(self.actions)
+        return actions
 
     def findPathToClosestDot(self, gameState):
         "Returns a path (a list of actions) to the closest dot, starting from gameState"
@@ -502,8 +829,34 @@ class ClosestDotSearchAgent(SearchAgent):
         walls = gameState.getWalls()
         problem = AnyFoodSearchProblem(gameState)
 
+        if getattr(self, 'junctions', False):
+            return junctionGraph.expandActions(search.aStarSearch(junctionSearchProblem(problem)))
         return search.aStarSearch(problem)
 
+def closestDotPlan(gameState):
+    """
+    Returns the actions that repeatedly walk to the closest remaining dot
+    until all the food is eaten, as ClosestDotSearchAgent does.
+
+    Instead of a new search per dot, this keeps one mazeDistances.DistanceField
+    to the remaining food: each leg walks down the field from Pacman, and
+    eating the dot at its end only repairs the part of the field that was
+    measured from that dot.  Pacman's position is tracked directly rather than
+    by generating GameState successors.
+    """
+    food = gameState.getFood().asList()
+    field = mazeDistances.DistanceField(gameState.getWalls(), food)
+    position = gameState.getPacmanPosition()
+    actions = []
+    for dot in food:
+        path = field.pathFrom(position)
+        if path is None:
+            break  # the rest of the food is walled off
+        actions += junctionGraph.pathActions([position] + path)
+        position = path[-1] if path else position
+        field.removeSource(position)
+    return actions
+
 class AnyFoodSearchProblem(PositionSearchProblem):
     """
       A search problem for finding a path to any food.
@@ -527,8 +880,9 @@ class AnyFoodSearchProblem(PositionSearchProblem):
         # Store info for the PositionSearchProblem (no need to change this)
         self.walls = gameState.getWalls()
         self.startState = gameState.getPacmanPosition()
-        self.costFn = lambda x: 1
+        self.costFn = unitCost
         self._visited, self._visitedlist, self._expanded = {}, [], 0
+        self._setHeadless(True) # the food is never drawn
 
     def isGoalState(self, state):
         """
@@ -538,16 +892,178 @@ class AnyFoodSearchProblem(PositionSearchProblem):
         x,y = state
         return self.food[x][y]
 
+def junctionSearchProblem(problem):
+    """
+    Wraps a PositionSearchProblem, AnyFoodSearchProblem or CornersProblem in
+    a junctionGraph.JunctionSearchProblem, so that searches only branch at
+    the junctions of the maze.  Solutions must be flattened with
+    junctionGraph.expandActions.
+    """
+    if isinstance(problem, CornersProblem):
+        return junctionGraph.JunctionSearchProblem(problem, problem.corners,
+                                                   position=lambda state: state[0],
+                                                   moveTo=problem.moveTo)
+    if isinstance(problem, AnyFoodSearchProblem):
+        return junctionGraph.JunctionSearchProblem(problem, problem.food.asList())
+    if isinstance(problem, PositionSearchProblem):
+        return junctionGraph.JunctionSearchProblem(problem, [problem.goal])
+    raise TypeError, 'no junction graph search for ' + problem.__class__.__name__
+
+class RealTimeSearchAgent(Agent):
+    """
+    A real-time search agent (RTAA*, a form of LRTA*): instead of planning
+    the whole path in registerInitialState, each move runs A* from Pacman's
+    state for at most lookahead expansions, raises the heuristic of every
+    state it expanded to f(best) - g(state), where best is the most
+    promising state left on the fringe, and takes the first step towards
+    best.  The work per move is bounded by lookahead, however big the board.
+
+    The raised heuristic values are kept in a table per layout and problem,
+    so repeated games on the same layout (pacman.py -n) start from what was
+    learned before, and their paths converge on optimal ones.  Passing save
+    (-a save) also keeps the table in the cache directory (util.cachePath)
+    between runs.
+
+      python pacman.py -l bigMaze -p RealTimeSearchAgent -a lookahead=32 -n 5 -z .5
+    """
+    def __init__(self, prob='PositionSearchProblem', heuristic='manhattanHeuristic', lookahead='16', save=None):
+        if prob not in globals().keys() or not prob.endswith('Problem'):
+            raise AttributeError, prob + ' is not a search problem type in SearchAgents.py.'
+        self.searchType = globals()[prob]
+        if heuristic in globals().keys():
+            self.heuristic = globals()[heuristic]
+        elif heuristic in dir(search):
+            self.heuristic = getattr(search, heuristic)
+        else:
+            raise AttributeError, heuristic + ' is not a function in searchAgents.py or search.py.'
+        self.lookahead = int(lookahead)
+        if self.lookahead < 1:
+            raise ValueError, 'lookahead must be at least 1, not ' + str(lookahead)
+        self.save = save != None
+
+    def registerInitialState(self, state):
+        self.problem = self.searchType(state)
+        self.problemState = self.problem.getStartState()
+        self.learningKey = _learningKey(self.problem, state)
+        self.learned = getLearnedHeuristic(self.learningKey, self.save)
+        self.moves = 0
+
+    def getAction(self, state):
+        "Looks ahead from the current problem state and returns one step towards the best fringe state"
+        problem = self.problem
+        if problem.isGoalState(self.problemState):
+            return Directions.STOP
+        step = self._lookahead()
+        if step is None:
+            return Directions.STOP
+        self.problemState, action = step
+        self.moves += 1
+        if self.save and problem.isGoalState(self.problemState):
+            saveLearnedHeuristic(self.learningKey)
+        return action
+
+    def h(self, problemState):
+        value = self.learned.get(problemState)
+        if value is None:
+            value = self.heuristic(problemState, self.problem)
+        return value
+
+    def _lookahead(self):
+        """
+        One bounded A* from the current state.  Returns the (successor,
+        action) of the first step towards the best fringe state, or None if
+        the current state has no successors.
+        """
+        problem, start = self.problem, self.problemState
+        fringe = util.PriorityQueue()
+        fringe.push((start, 0, None), self.h(start))
+        bestG = {start: 0}
+        closed = {}
+        while not fringe.isEmpty():
+            problemState, g, firstStep = fringe.pop()
+            if problemState in closed or g > bestG[problemState]:
+                continue
+            if len(closed) >= self.lookahead or (firstStep is not None and problem.isGoalState(problemState)):
+                break
+            closed[problemState] = g
+            for successor, action, stepCost in problem.getSuccessors(problemState):
+                successorG = g + stepCost
+                if successor in closed or successorG >= bestG.get(successor, float('inf')):
+                    continue
+                bestG[successor] = successorG
+                fringe.push((successor, successorG, firstStep or (successor, action)),
+                            successorG + self.h(successor))
+        else:
+            return None  # everything reachable was expanded without a goal
+
+        # Every expanded state is at least f(best) - g(state) from a goal
+        f = g + self.h(problemState)
+        for expanded, expandedG in closed.iteritems():
+            if f - expandedG > self.h(expanded):
+                self.learned[expanded] = f - expandedG
+        return firstStep
+
+def _learningKey(problem, gameState):
+    """
+    Identifies what a learned heuristic table is about: the layout's walls,
+    the kind of problem and its goal.
+    """
+    goal = getattr(problem, 'goal', None) or getattr(problem, 'corners', None) or gameState.getFood().asList()
+    return (mazeDistances.wallsKey(problem.walls), problem.__class__.__name__, str(goal))
+
+_learnedHeuristics = {} # learning key -> {problem state: learned heuristic value}
+
+def getLearnedHeuristic(key, useCache=False):
+    """
+    Returns the table of learned heuristic values for key, shared by every
+    RealTimeSearchAgent in this process, loading it from the cache directory
+    the first time if useCache is set.
+    """
+    if key not in _learnedHeuristics:
+        table = {}
+        if useCache:
+            try:
+                f = open(_learnedHeuristicPath(key), 'rb')
+                try: table = cPickle.load(f)
+                finally: f.close()
+            except (IOError, EOFError, cPickle.UnpicklingError):
+                pass
+        _learnedHeuristics[key] = table
+    return _learnedHeuristics[key]
+
+def saveLearnedHeuristic(key):
+    "Writes the learned heuristic table for key to the cache directory"
+    util.writeCacheFile(_learnedHeuristicPath(key),
+                        cPickle.dumps(_learnedHeuristics[key], cPickle.HIGHEST_PROTOCOL))
+
+def _learnedHeuristicPath(key):
+    return util.cachePath('learnedHeuristic-%s.pickle' % hashlib.sha1(repr(key)).hexdigest())
+
 ##################
 # Mini-contest 1 #
 ##################
 
 class ApproximateSearchAgent(Agent):
-    "Implement your contest entry here.  Change anything but the class name."
+    """
+    Plans a path through all the food with anytime repairing A*
+    (search.anytimeAStarSearch) on the FoodSearchProblem, using foodHeuristic.
+    A first, inflated-weight plan comes quickly; the rest of the timeLimit
+    budget (in seconds, e.g. -a timeLimit=5) goes into improving it.
+    """
+    def __init__(self, timeLimit=10.0, initialWeight=3.0, weightStep=0.5):
+        self.timeLimit = float(timeLimit)
+        self.initialWeight = float(initialWeight)
+        self.weightStep = float(weightStep)
 
     def registerInitialState(self, state):
         "This method is called before any moves are made."
-        "*** YOUR CODE HERE ***"
+        starttime = time.time()
+        problem = FoodSearchProblem(state)
+        self.actions = search.anytimeAStarSearch(problem, foodHeuristic, self.timeLimit,
+                                                 self.initialWeight, self.weightStep)
+        self.actionIndex = 0
+        print('Path found with total cost of %d in %.1f seconds' %
+              (problem.getCostOfActions(self.actions), time.time() - starttime))
 
     def getAction(self, state):
         """
@@ -555,8 +1071,11 @@ class ApproximateSearchAgent(Agent):
         The Agent will receive a GameState and must return an action from
         Directions.{North, South, East, West, Stop}
         """
-        "*** YOUR CODE HERE ***"
-        util.raiseNotDefined()
+        i = self.actionIndex
+        self.actionIndex += 1
+        if i < len(self.actions):
+            return self.actions[i]
+        return Directions.STOP
 
 def mazeDistance(point1, point2, gameState):
     """
@@ -567,11 +1086,38 @@ def mazeDistance(point1, point2, gameState):
     Example usage: mazeDistance( (2,4), (5,6), gameState)
 
     This might be a useful helper function for your ApproximateSearchAgent.
+
+    Distances come from the layout's all-pairs table (see mazeDistances.py),
+    so after the first call on a layout every call is a single lookup.
+    Layouts too big for a table are searched with jump point search instead.
     """
     x1, y1 = point1
     x2, y2 = point2
     walls = gameState.getWalls()
-    assert not walls[x1][y1], 'point1 is a wall: ' + point1
+    assert not walls[x1][y1], 'point1 is a wall: ' + str(point1)
     assert not walls[x2][y2], 'point2 is a wall: ' + str(point2)
+    if fitsMazeDistanceTable(walls):
+        return mazeDistances.getMazeDistances(walls).distance(point1, point2)
     prob = PositionSearchProblem(gameState, start=point1, goal=point2, warn=False, visualize=False)
-    return len(search.bfs(prob))
+    path = search.jumpPointSearch(prob, manhattanHeuristic)
+    if path is False: return float('inf')
+    return len(path)
+
+# Most open cells for which mazeDistance builds an all-pairs table.  The table
+# grows with the square of the open cells: 2000 cells is 8MB of distances.
+MAZE_DISTANCE_TABLE_CELLS = 2000
+
+_fitsTable = {}  # id(walls) -> (walls, fits)
+
+def fitsMazeDistanceTable(walls):
+    """
+    True if the all-pairs distance table for walls is within
+    MAZE_DISTANCE_TABLE_CELLS.  Counting the open cells scans the board, so
+    the answer is kept per layout: heuristics ask on every evaluation.
+    """
+    if walls.width * walls.height <= MAZE_DISTANCE_TABLE_CELLS: return True
+    entry = _fitsTable.get(id(walls))
+    if entry is None or entry[0] is not walls:
+        entry = (walls, walls.count(False) <= MAZE_DISTANCE_TABLE_CELLS)
+        _fitsTable[id(walls)] = entry
+    return entry[1]
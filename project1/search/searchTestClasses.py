@@ -14,7 +14,9 @@ import textwrap
 
 # import project specific code
 import layout
+import mazeDistances
 import pacman
+import util
 from search import SearchProblem
 
 # helper function for printing solutions in solution files
@@ -876,5 +878,278 @@ class ExtraGrade(testClasses.TestCase):
       handle.close()
       return True
 
-      
 
+
+class QueueTest(testClasses.TestCase):
+    """
+    Runs a short script against one of the priority queues in util.py and
+    checks the order in which items come back out.  Each line of the
+    operations field is one of
+
+      push ITEM PRIORITY
+      update ITEM PRIORITY
+      pop
+
+    A pop from an empty queue is recorded as 'empty'.  For the *WithFunction
+    queues, items are (name, priority) pairs and update is a plain push.
+    """
+
+    def __init__(self, question, testDict):
+        super(QueueTest, self).__init__(question, testDict)
+        self.queueClass = testDict['queue']
+        self.operations = [l.split() for l in testDict['operations'].split('\n') if l.strip()]
+
+    def makeQueue(self):
+        queueClass = getattr(util, self.queueClass)
+        if self.queueClass.endswith('WithFunction'):
+            return queueClass(lambda entry: entry[1], lambda entry: entry[0])
+        return queueClass()
+
+    def run(self):
+        queue = self.makeQueue()
+        withFunction = self.queueClass.endswith('WithFunction')
+        pops = []
+        for operation in self.operations:
+            if operation[0] == 'pop':
+                try:
+                    item = queue.pop()
+                except IndexError:
+                    pops.append('empty')
+                    continue
+                pops.append(item[0] if withFunction else item)
+                continue
+            item, priority = operation[1], operation[2]
+            priority = float(priority) if '.' in priority else int(priority)
+            if withFunction:
+                queue.push((item, priority))
+            else:
+                getattr(queue, operation[0])(item, priority)
+        return pops
+
+    def execute(self, grades, moduleDict, solutionDict):
+        gold = solutionDict['pops'].split()
+        pops = self.run()
+        if pops != gold:
+            grades.addMessage('FAIL: %s' % self.path)
+            grades.addMessage('\tqueue:\t\t%s' % self.queueClass)
+            grades.addMessage('\tpopped:\t\t%s' % ' '.join(pops))
+            grades.addMessage('\texpected:\t%s' % ' '.join(gold))
+            return False
+        grades.addMessage('PASS: %s' % self.path)
+        grades.addMessage('\tqueue:\t\t%s' % self.queueClass)
+        return True
+
+    def writeSolution(self, moduleDict, filePath):
+        handle = open(filePath, 'w')
+        handle.write('# This is the solution file for %s.\n' % self.path)
+        handle.write('pops: "%s"\n' % ' '.join(self.run()))
+        handle.close()
+        return True
+
+
+
+class FoodSolverTest(testClasses.TestCase):
+    """
+    Checks that a FoodSearchProblem solver in searchAgents.py (named by the
+    solver field) eats all the food with a path as short as the one A*
+    finds with foodHeuristic.
+    """
+
+    def __init__(self, question, testDict):
+        super(FoodSolverTest, self).__init__(question, testDict)
+        self.layoutText = testDict['layout']
+        self.layoutName = testDict['layoutName']
+        self.solverName = testDict['solver']
+
+    def setupProblem(self, searchAgents):
+        lay = layout.Layout([l.strip() for l in self.layoutText.split('\n')])
+        gameState = pacman.GameState()
+        gameState.initialize(lay, 0)
+        return searchAgents.FoodSearchProblem(gameState)
+
+    def execute(self, grades, moduleDict, solutionDict):
+        search = moduleDict['search']
+        searchAgents = moduleDict['searchAgents']
+        gold = int(solutionDict['solution_cost'])
+        problem = self.setupProblem(searchAgents)
+        path = getattr(searchAgents, self.solverName)(problem)
+        aStarCost = problem.getCostOfActions(search.astar(problem, searchAgents.foodHeuristic))
+
+        if type(path) != type([]):
+            grades.addMessage('FAIL: %s' % self.path)
+            grades.addMessage('\tThe result must be a list. (Instead, it is %s)' % type(path))
+            return False
+        states = followPath(path, problem)
+        if None in states or not problem.isGoalState(states[-1]):
+            grades.addMessage('FAIL: %s' % self.path)
+            grades.addMessage('\tThe path does not eat all the food.')
+            return False
+        cost = problem.getCostOfActions(path)
+        if cost != gold or aStarCost != gold:
+            grades.addMessage('FAIL: %s' % self.path)
+            grades.addMessage('\t%s path cost:\t%s' % (self.solverName, cost))
+            grades.addMessage('\tastar path cost:\t%s' % aStarCost)
+            grades.addMessage('\toptimal path cost:\t%s' % gold)
+            return False
+
+        grades.addMessage('PASS: %s' % self.path)
+        grades.addMessage('\tpacman layout:\t\t%s' % self.layoutName)
+        grades.addMessage('\tsolution cost:\t\t%s' % cost)
+        return True
+
+    def writeSolution(self, moduleDict, filePath):
+        search = moduleDict['search']
+        searchAgents = moduleDict['searchAgents']
+        handle = open(filePath, 'w')
+        handle.write('# This is the solution file for %s.\n' % self.path)
+        problem = self.setupProblem(searchAgents)
+        cost = problem.getCostOfActions(search.astar(problem, searchAgents.foodHeuristic))
+        handle.write('solution_cost: "%s"\n' % cost)
+        handle.close()
+        return True
+
+
+
+class JumpPointTest(testClasses.TestCase):
+    """
+    Compares the path cost of jumpPointSearch, with and without
+    manhattanHeuristic, against breadthFirstSearch for each query of the
+    queries field ("x1 y1 x2 y2" per line: a start and a goal) on a layout.
+    An unreachable goal is recorded as 'none'.
+    """
+
+    def __init__(self, question, testDict):
+        super(JumpPointTest, self).__init__(question, testDict)
+        self.layoutText = testDict['layout']
+        self.layoutName = testDict['layoutName']
+        self.queries = [tuple(map(int, l.split())) for l in testDict['queries'].split('\n') if l.strip()]
+
+    def costs(self, search, searchAgents, function):
+        lay = layout.Layout([l.strip() for l in self.layoutText.split('\n')])
+        gameState = pacman.GameState()
+        gameState.initialize(lay, 0)
+        costs = []
+        for x1, y1, x2, y2 in self.queries:
+            problem = searchAgents.PositionSearchProblem(gameState, start=(x1, y1), goal=(x2, y2),
+                                                         warn=False, visualize=False)
+            path = function(problem)
+            if path is False:
+                costs.append('none')
+            elif not checkSolution(problem, path):
+                costs.append('invalid')
+            else:
+                costs.append(str(problem.getCostOfActions(path)))
+        return costs
+
+    def execute(self, grades, moduleDict, solutionDict):
+        search = moduleDict['search']
+        searchAgents = moduleDict['searchAgents']
+        gold = solutionDict['costs'].split()
+        results = [('breadthFirstSearch', self.costs(search, searchAgents, search.bfs)),
+                   ('jumpPointSearch', self.costs(search, searchAgents, search.jumpPointSearch)),
+                   ('jumpPointSearch with manhattanHeuristic',
+                    self.costs(search, searchAgents,
+                               lambda problem: search.jumpPointSearch(problem, searchAgents.manhattanHeuristic)))]
+        for name, costs in results:
+            if costs != gold:
+                grades.addMessage('FAIL: %s' % self.path)
+                grades.addMessage('\tpacman layout:\t\t%s' % self.layoutName)
+                grades.addMessage('\t%s path costs:\t%s' % (name, ' '.join(costs)))
+                grades.addMessage('\toptimal path costs:\t%s' % ' '.join(gold))
+                return False
+        grades.addMessage('PASS: %s' % self.path)
+        grades.addMessage('\tpacman layout:\t\t%s' % self.layoutName)
+        grades.addMessage('\tqueries:\t\t%d' % len(self.queries))
+        return True
+
+    def writeSolution(self, moduleDict, filePath):
+        search = moduleDict['search']
+        searchAgents = moduleDict['searchAgents']
+        handle = open(filePath, 'w')
+        handle.write('# This is the solution file for %s.\n' % self.path)
+        handle.write('costs: "%s"\n' % ' '.join(self.costs(search, searchAgents, search.bfs)))
+        handle.close()
+        return True
+
+
+
+class DistanceFieldTest(testClasses.TestCase):
+    """
+    Builds a mazeDistances.DistanceField to the food of a layout, removes
+    the sources listed in the removals field ("x y" per line) one at a
+    time, and after each step compares the distance of every open cell
+    with a fresh breadth-first search from the remaining sources.  Each
+    step is summarized as 'total/unreachable' over all open cells.
+    """
+
+    def __init__(self, question, testDict):
+        super(DistanceFieldTest, self).__init__(question, testDict)
+        self.layoutText = testDict['layout']
+        self.layoutName = testDict['layoutName']
+        self.removals = [tuple(map(int, l.split())) for l in testDict['removals'].split('\n') if l.strip()]
+
+    def breadthFirst(self, walls, sources):
+        distances = dict((source, 0) for source in sources)
+        frontier = list(sources)
+        while frontier:
+            nextFrontier = []
+            for x, y in frontier:
+                for cell in ((x, y + 1), (x, y - 1), (x + 1, y), (x - 1, y)):
+                    if cell not in distances and not walls[cell[0]][cell[1]]:
+                        distances[cell] = distances[(x, y)] + 1
+                        nextFrontier.append(cell)
+            frontier = nextFrontier
+        return distances
+
+    def run(self):
+        """
+        Returns the summary of every step, and a message describing the
+        first disagreement with breadth-first search (None if there is none).
+        Paths are only walked once every distance is right, since pathFrom
+        need not end on a field that is wrong.
+        """
+        lay = layout.Layout([l.strip() for l in self.layoutText.split('\n')])
+        walls = lay.walls
+        cells = [(x, y) for x in range(walls.width) for y in range(walls.height) if not walls[x][y]]
+        sources = set(lay.food.asList())
+        field = mazeDistances.DistanceField(walls, sources)
+        summaries = []
+        for step in range(len(self.removals) + 1):
+            if step > 0:
+                field.removeSource(self.removals[step - 1])
+                sources.discard(self.removals[step - 1])
+            expected = self.breadthFirst(walls, sources)
+            for cell in cells:
+                if field.distance(cell) != expected.get(cell, float('inf')):
+                    return summaries, 'after %d removals, distance of %s is %s, not %s' % (
+                        step, cell, field.distance(cell), expected.get(cell, float('inf')))
+            for cell in expected:
+                path = field.pathFrom(cell)
+                if len(path) != expected[cell] or (path and path[-1] not in sources):
+                    return summaries, 'after %d removals, the path from %s does not end at the nearest source' % (
+                        step, cell)
+            summaries.append('%d/%d' % (sum(expected.values()), len(cells) - len(expected)))
+        return summaries, None
+
+    def execute(self, grades, moduleDict, solutionDict):
+        gold = solutionDict['steps'].split()
+        summaries, message = self.run()
+        if message is not None or summaries != gold:
+            grades.addMessage('FAIL: %s' % self.path)
+            grades.addMessage('\tpacman layout:\t\t%s' % self.layoutName)
+            if message is not None:
+                grades.addMessage('\t%s' % message)
+            grades.addMessage('\tsteps:\t\t%s' % ' '.join(summaries))
+            grades.addMessage('\texpected:\t%s' % ' '.join(gold))
+            return False
+        grades.addMessage('PASS: %s' % self.path)
+        grades.addMessage('\tpacman layout:\t\t%s' % self.layoutName)
+        grades.addMessage('\tremovals:\t\t%d' % len(self.removals))
+        return True
+
+    def writeSolution(self, moduleDict, filePath):
+        handle = open(filePath, 'w')
+        handle.write('# This is the solution file for %s.\n' % self.path)
+        handle.write('steps: "%s"\n' % ' '.join(self.run()[0]))
+        handle.close()
+        return True
@@ -9,8 +9,11 @@
 # For more info, see http://inst.eecs.berkeley.edu/~cs188/pacman/pacman.html
 
 import sys
+import os
 import inspect
+import array
 import heapq, random
+from collections import deque, OrderedDict
 import cStringIO
 
 
@@ -130,6 +133,9 @@ class Stack:
         "Returns true if the stack is empty"
         return len(self.list) == 0
 
+    def __len__(self):
+        return len(self.list)
+
 class Queue:
     "A container with a first-in-first-out (FIFO) queuing policy."
     def __init__(self):
@@ -150,6 +156,9 @@ class Queue:
         "Returns true if the queue is empty"
         return len(self.list) == 0
 
+    def __len__(self):
+        return len(self.list)
+
 class PriorityQueue:
     """
       Implements a priority queue data structure. Each inserted item
@@ -181,6 +190,9 @@ class PriorityQueue:
     def isEmpty(self):
         return len(self.heap) == 0
 
+    def __len__(self):
+        return len(self.heap)
+
 class PriorityQueueWithFunction(PriorityQueue):
     """
     Implements a priority queue with the same push/pop signature of the
@@ -198,10 +210,352 @@ class PriorityQueueWithFunction(PriorityQueue):
         PriorityQueue.push(self, item, self.priorityFunction(item))
 
 
+def _entryLess(a, b):
+    "Orders heap entries [priority, count, ...] by priority, then FIFO"
+    return a[0] < b[0] or (a[0] == b[0] and a[1] < b[1])
+
+class IndexedPriorityQueue:
+    """
+      A binary heap that keeps an index from each item's key to its position
+      in the heap, so that the priority of an item already in the queue can
+      be lowered in O(log n) instead of pushing a duplicate.
+
+      Items are identified by keyFunction(item) (the item itself by default).
+      Ties are broken in FIFO order, exactly like PriorityQueue: an item whose
+      priority is lowered counts as freshly pushed.
+    """
+    def  __init__(self, keyFunction=None):
+        self.heap = []
+        self.index = {}
+        self.count = 0
+        self.keyFunction = keyFunction
+
+    def _key(self, item):
+        if self.keyFunction is None: return item
+        return self.keyFunction(item)
+
+    def push(self, item, priority):
+        "Adds an item that is not yet in the queue"
+        key = self._key(item)
+        if key in self.index:
+            raise ValueError('item already in queue; use update instead')
+        self.index[key] = len(self.heap)
+        self.heap.append([priority, self.count, item, key])
+        self.count += 1
+        self._siftUp(len(self.heap) - 1)
+
+    def pop(self):
+        heap = self.heap
+        last = heap.pop()
+        if heap:
+            entry = heap[0]
+            heap[0] = last
+            self.index[last[3]] = 0
+            self._siftDown(0)
+        else:
+            entry = last
+        del self.index[entry[3]]
+        return entry[2]
+
+    def update(self, item, priority):
+        """
+          Pushes item if its key is not in the queue.  If it is, and the new
+          priority is strictly lower, the stored item is replaced and moved up
+          the heap.  Otherwise nothing happens.  Returns True if the queue
+          changed.
+        """
+        key = self._key(item)
+        if key not in self.index:
+            IndexedPriorityQueue.push(self, item, priority)
+            return True
+        i = self.index[key]
+        entry = self.heap[i]
+        if entry[0] <= priority:
+            return False
+        entry[0], entry[1], entry[2] = priority, self.count, item
+        self.count += 1
+        self._siftUp(i)
+        return True
+
+    def peekPriority(self):
+        "Returns the lowest priority in the queue without removing its item"
+        return self.heap[0][0]
+
+    def items(self):
+        "Returns the queued items, in no particular order"
+        return [entry[2] for entry in self.heap]
+
+    def __contains__(self, item):
+        return self._key(item) in self.index
+
+    def __len__(self):
+        return len(self.heap)
+
+    def isEmpty(self):
+        return len(self.heap) == 0
+
+    def _siftUp(self, i):
+        heap, index = self.heap, self.index
+        entry = heap[i]
+        while i > 0:
+            parent = (i - 1) >> 1
+            if not _entryLess(entry, heap[parent]): break
+            heap[i] = heap[parent]
+            index[heap[i][3]] = i
+            i = parent
+        heap[i] = entry
+        index[entry[3]] = i
+
+    def _siftDown(self, i):
+        heap, index = self.heap, self.index
+        n = len(heap)
+        entry = heap[i]
+        while True:
+            child = 2 * i + 1
+            if child >= n: break
+            if child + 1 < n and _entryLess(heap[child + 1], heap[child]):
+                child += 1
+            if not _entryLess(heap[child], entry): break
+            heap[i] = heap[child]
+            index[heap[i][3]] = i
+            i = child
+        heap[i] = entry
+        index[entry[3]] = i
+
+
+class BucketQueue:
+    """
+      A priority queue for small non-negative integer priorities (a bucket
+      queue, as in Dial's algorithm).  There is one FIFO bucket per priority
+      and a cursor at the lowest bucket that may be non-empty, so push and
+      pop are O(1) as long as popped priorities never decrease, which is the
+      case for uniform cost search and A* with a consistent heuristic.
+
+      Like IndexedPriorityQueue, each key is in the queue at most once and
+      ties are broken in FIFO order, so items come out in exactly the order
+      a PriorityQueue would produce.
+    """
+    def  __init__(self, keyFunction=None, maxPriority=1 << 16):
+        self.buckets = []
+        self.index = {}   # key -> live entry [priority, item]
+        self.cursor = 0
+        self.size = 0
+        self.keyFunction = keyFunction
+        self.maxPriority = maxPriority
+
+    def _key(self, item):
+        if self.keyFunction is None: return item
+        return self.keyFunction(item)
+
+    def accepts(self, priority):
+        "Returns whether priority can be stored in a bucket"
+        return isinstance(priority, (int, long)) and 0 <= priority <= self.maxPriority
+
+    def push(self, item, priority):
+        "Adds an item that is not yet in the queue"
+        key = self._key(item)
+        if key in self.index:
+            raise ValueError('item already in queue; use update instead')
+        self._insert(key, item, priority)
+
+    def _insert(self, key, item, priority):
+        if not self.accepts(priority):
+            raise ValueError('bucket priorities must be integers in [0, %d]: %s' % (self.maxPriority, priority))
+        buckets = self.buckets
+        if priority >= len(buckets):
+            buckets.extend([None] * (priority + 1 - len(buckets)))
+        if buckets[priority] is None:
+            buckets[priority] = deque()
+        entry = [priority, item]
+        buckets[priority].append(entry)
+        self.index[key] = entry
+        if priority < self.cursor:
+            self.cursor = priority
+        self.size += 1
+
+    def pop(self):
+        if self.size == 0:
+            raise IndexError('pop from an empty queue')
+        buckets = self.buckets
+        while True:
+            bucket = buckets[self.cursor]
+            if not bucket:
+                self.cursor += 1
+                continue
+            entry = bucket.popleft()
+            if entry[0] is not None: break  # skip entries whose priority was lowered
+        item = entry[1]
+        del self.index[self._key(item)]
+        self.size -= 1
+        return item
+
+    def update(self, item, priority):
+        """
+          Same contract as IndexedPriorityQueue.update: pushes item if its key
+          is not queued, replaces the queued item if the new priority is
+          strictly lower, and otherwise does nothing.
+        """
+        key = self._key(item)
+        entry = self.index.get(key)
+        if entry is not None:
+            if entry[0] <= priority:
+                return False
+            entry[0] = None
+            self.size -= 1
+        self._insert(key, item, priority)
+        return True
+
+    def entries(self):
+        "Yields the live (item, priority) pairs in the order they would be popped"
+        for priority in range(self.cursor, len(self.buckets)):
+            for entry in self.buckets[priority] or ():
+                if entry[0] is not None:
+                    yield entry[1], entry[0]
+
+    def __contains__(self, item):
+        return self._key(item) in self.index
+
+    def __len__(self):
+        return self.size
+
+    def isEmpty(self):
+        return self.size == 0
+
+class BucketQueueWithFunction(BucketQueue):
+    """
+    A BucketQueue with the push/pop signature of the Queue and the Stack
+    classes.  It starts out as a bucket queue and, the first time the priority
+    function returns something other than a small non-negative integer (a
+    fractional cost or heuristic, say), moves its contents into an
+    IndexedPriorityQueue and carries on with that.  The pop order is the same
+    either way.
+    """
+    def  __init__(self, priorityFunction, keyFunction=None, maxPriority=1 << 16):
+        "priorityFunction (item) -> priority, keyFunction (item) -> hashable key"
+        self.priorityFunction = priorityFunction
+        self.heap = None
+        BucketQueue.__init__(self, keyFunction, maxPriority)
+
+    def push(self, item):
+        "Adds an item, or lowers the priority of the queued item with its key"
+        priority = self.priorityFunction(item)
+        if self.heap is None:
+            if self.accepts(priority):
+                BucketQueue.update(self, item, priority)
+                return
+            self._switchToHeap()
+        self.heap.update(item, priority)
+
+    def _switchToHeap(self):
+        heap = IndexedPriorityQueue(self.keyFunction)
+        for item, priority in self.entries():
+            heap.push(item, priority)
+        self.heap = heap
+        self.buckets, self.index, self.size = [], {}, 0
+
+    def pop(self):
+        if self.heap is not None: return self.heap.pop()
+        return BucketQueue.pop(self)
+
+    def __contains__(self, item):
+        if self.heap is not None: return item in self.heap
+        return BucketQueue.__contains__(self, item)
+
+    def __len__(self):
+        if self.heap is not None: return len(self.heap)
+        return self.size
+
+    def isEmpty(self):
+        return len(self) == 0
+
+
 def manhattanDistance( xy1, xy2 ):
     "Returns the Manhattan distance between points xy1 and xy2"
     return abs( xy1[0] - xy2[0] ) + abs( xy1[1] - xy2[1] )
 
+CACHE_DIRECTORY = os.environ.get('PACMAN_CACHE_DIR',
+                                 os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cache'))
+
+def cachePath(filename):
+    """
+    Returns the path of filename inside the directory used to persist
+    precomputed tables between runs ($PACMAN_CACHE_DIR, or 'cache' next to
+    this file), creating the directory if needed.  If it cannot be created,
+    reads and writes of the path fail as they would for a missing file.
+    """
+    if not os.path.isdir(CACHE_DIRECTORY):
+        try:
+            os.makedirs(CACHE_DIRECTORY)
+        except OSError:
+            pass  # created concurrently, or unwritable
+    return os.path.join(CACHE_DIRECTORY, filename)
+
+class LRUCache:
+    """
+    A dictionary-like cache that keeps only the maxSize most recently used
+    keys, so memoized values cannot grow without bound.
+    """
+    def __init__(self, maxSize):
+        self.maxSize = maxSize
+        self.data = OrderedDict()
+
+    def get(self, key, default=None):
+        try:
+            value = self.data.pop(key)
+        except KeyError:
+            return default
+        self.data[key] = value
+        return value
+
+    def __setitem__(self, key, value):
+        self.data.pop(key, None)
+        self.data[key] = value
+        if len(self.data) > self.maxSize:
+            self.data.popitem(last=False)
+
+    def __contains__(self, key):
+        return key in self.data
+
+    def __len__(self):
+        return len(self.data)
+
+def writeCacheFile(path, data):
+    """
+    Writes data to path atomically, so concurrent readers never see a partial
+    file.  Returns False if the file cannot be written, which callers may
+    ignore: the cache is only an optimization.
+    """
+    tmpPath = '%s.%d.tmp' % (path, os.getpid())
+    try:
+        f = open(tmpPath, 'wb')
+        try: f.write(data)
+        finally: f.close()
+        os.rename(tmpPath, path)
+    except (IOError, OSError):
+        if os.path.exists(tmpPath): os.remove(tmpPath)
+        return False
+    return True
+
+def readCacheArray(path, typecode, length):
+    """
+    Returns the array of length items of typecode that writeCacheFile stored
+    at path, or None if there is no such file or it has a different length.
+    """
+    table = array.array(typecode)
+    try:
+        f = open(path, 'rb')
+    except IOError:
+        return None
+    try:
+        try:
+            table.fromfile(f, length)
+        except EOFError:
+            return None
+        if f.read(1): return None
+    finally:
+        f.close()
+    return table
+
 """
   Data structures and functions useful for various course projects
 